@@ -1,18 +1,58 @@
+from __future__ import annotations
+
 import os
 import json
+import importlib
 import uuid
+import time
+import hmac
+import hashlib
+import queue
+import atexit
+import bisect
+import itertools
+import threading
+import weakref
 import math
+import random
+import logging
+import logging.handlers
 import pickle
 import sqlite3
 import re
-from typing import Any, Optional, List
-from datetime import datetime
-
-from flask import Flask, request, jsonify, send_from_directory, session, g
+import csv
+import zlib
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Optional, List, Tuple
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta
+
+from flask import Flask, Response, request, jsonify, send_from_directory, session, g, stream_with_context
 from flask_cors import CORS
 from werkzeug.security import generate_password_hash, check_password_hash
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+
+if TYPE_CHECKING:
+    import numpy as np
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+class _LazyModule:
+    """Stand-in for a heavy module: imports it on first attribute access, then replaces itself.
+
+    Keeps numpy out of the import of this module, so tools that only need the rule-based
+    helpers, and the web process before its model warm-up, start quickly.
+    """
+
+    def __init__(self, name: str, alias: str):
+        self._name = name
+        self._alias = alias
+
+    def __getattr__(self, attr: str) -> Any:
+        module = importlib.import_module(self._name)
+        globals()[self._alias] = module
+        return getattr(module, attr)
+
+if not TYPE_CHECKING:
+    np = _LazyModule('numpy', 'np')
 
 # ------------------------------------------------------------------------------
 # App & Config
@@ -51,17 +91,329 @@ CORS(
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 MODELS_DIR = os.path.join(BASE_DIR, 'models')
 DATABASE_DIR = os.path.join(BASE_DIR, 'database')
-DATABASE_PATH = os.path.join(DATABASE_DIR, 'app.db')
+DATABASE_PATH = os.environ.get('DATABASE_PATH', os.path.join(DATABASE_DIR, 'app.db'))
 MODEL_PATH = os.path.join(MODELS_DIR, 'fake_job_model.pkl')  # your chosen filename
 
+# 'pickle' unpickles MODEL_PATH into private memory; 'mmap' loads a joblib copy of it with
+# memory-mapped arrays so workers on the same box share the read-only pages
+MODEL_LOAD_MODE = os.environ.get('MODEL_LOAD_MODE', 'pickle').lower()
+
+# 'auto' scores supported models (logistic regression, decision trees, random/extra forests) with
+# a NumPy-only scorer compiled at load time; 'sklearn' always calls the estimator itself
+MODEL_BACKEND = os.environ.get('MODEL_BACKEND', 'auto').lower()
+
+# 'background' loads the model on a thread after import and /api/health reports when it is
+# ready; 'sync' loads it during import
+MODEL_WARMUP = os.environ.get('MODEL_WARMUP', 'background').lower()
+# How long analyze_job_description(s) called outside a request wait for the warm-up (seconds)
+MODEL_READY_TIMEOUT = float(os.environ.get('MODEL_READY_TIMEOUT', '60'))
+
+# Model registry: every <version>.pkl in MODELS_DIR is a version, the ACTIVE file names the active one
+DEFAULT_MODEL_VERSION = os.path.splitext(os.path.basename(MODEL_PATH))[0]
+MODEL_ACTIVE_POINTER = os.path.join(MODELS_DIR, 'ACTIVE')
+MODEL_REGISTRY_POLL_SECONDS = float(os.environ.get('MODEL_REGISTRY_POLL_SECONDS', '5'))
+
+# Bearer token for admin endpoints; they are disabled when unset
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN', '')
+
+# Batch analysis limits
+ANALYZE_BATCH_MAX_ITEMS = int(os.environ.get('ANALYZE_BATCH_MAX_ITEMS', '10000'))
+ANALYZE_BATCH_CHUNK_SIZE = max(1, int(os.environ.get('ANALYZE_BATCH_CHUNK_SIZE', '512')))
+# Postings scored per chunk by the streaming endpoint and score_feed.py
+STREAM_CHUNK_SIZE = max(1, int(os.environ.get('STREAM_CHUNK_SIZE', '256')))
+# Feature rows accepted by one /api/predict call
+PREDICT_MAX_ROWS = int(os.environ.get('PREDICT_MAX_ROWS', '10000'))
+
+# Request threads per gunicorn worker (gunicorn.conf.py reads the same variable). Each call admitted
+# to the pools below holds one of them while it waits, so between them the pools admit fewer calls
+# than there are threads and RESERVED_REQUEST_THREADS stay free for cheap routes.
+REQUEST_THREADS = max(1, int(os.environ.get('GUNICORN_THREADS', '16')))
+RESERVED_REQUEST_THREADS = max(1, REQUEST_THREADS // 4)
+POOL_ADMISSION_BUDGET = max(1, REQUEST_THREADS - RESERVED_REQUEST_THREADS)
+# Two thirds of the admitted calls go to inference, the rest to password hashing
+INFERENCE_ADMISSION = max(1, POOL_ADMISSION_BUDGET * 2 // 3)
+PASSWORD_HASH_ADMISSION = max(1, POOL_ADMISSION_BUDGET - INFERENCE_ADMISSION)
+
+# Bounded pool that runs model inference off the request threads (0 workers runs it inline)
+INFERENCE_WORKERS = int(os.environ.get('INFERENCE_WORKERS', str(min(4, os.cpu_count() or 1, INFERENCE_ADMISSION))))
+INFERENCE_QUEUE_SIZE = int(os.environ.get('INFERENCE_QUEUE_SIZE', str(max(0, INFERENCE_ADMISSION - INFERENCE_WORKERS))))
+INFERENCE_TIMEOUT = float(os.environ.get('INFERENCE_TIMEOUT', '10'))
+
+# Concurrent single-row predict_proba calls are coalesced into batches (max size 1 disables it)
+MICRO_BATCH_MAX_SIZE = int(os.environ.get('MICRO_BATCH_MAX_SIZE', '64'))
+MICRO_BATCH_MAX_WAIT_MS = float(os.environ.get('MICRO_BATCH_MAX_WAIT_MS', '1'))
+
+# Password hashing runs on its own bounded pool so login bursts can't starve analysis
+PASSWORD_HASH_WORKERS = int(os.environ.get(
+    'PASSWORD_HASH_WORKERS', str(max(1, min((os.cpu_count() or 1) // 2, PASSWORD_HASH_ADMISSION)))
+))
+PASSWORD_HASH_QUEUE_SIZE = int(os.environ.get(
+    'PASSWORD_HASH_QUEUE_SIZE', str(max(0, PASSWORD_HASH_ADMISSION - PASSWORD_HASH_WORKERS))
+))
+PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', '5'))
+
+# Emails that matched no user are remembered briefly so repeated logins for them skip the database
+UNKNOWN_EMAIL_CACHE_SIZE = int(os.environ.get('UNKNOWN_EMAIL_CACHE_SIZE', '10000'))
+UNKNOWN_EMAIL_CACHE_TTL = float(os.environ.get('UNKNOWN_EMAIL_CACHE_TTL', '30'))
+
+# Analysis result cache (size 0 disables it)
+ANALYSIS_CACHE_SIZE = int(os.environ.get('ANALYSIS_CACHE_SIZE', '4096'))
+ANALYSIS_CACHE_TTL = float(os.environ.get('ANALYSIS_CACHE_TTL', '3600'))
+
+# Near-duplicate index of analyzed postings (size 0 disables it). Postings whose word shingles
+# are at least NEAR_DUPLICATE_SIMILARITY alike count as similar; at NEAR_DUPLICATE_REUSE_SIMILARITY
+# (off when 0) the closest indexed result is returned without running the analysis
+NEAR_DUPLICATE_INDEX_SIZE = int(os.environ.get('NEAR_DUPLICATE_INDEX_SIZE', '20000'))
+NEAR_DUPLICATE_SIMILARITY = float(os.environ.get('NEAR_DUPLICATE_SIMILARITY', '0.7'))
+NEAR_DUPLICATE_REUSE_SIMILARITY = float(os.environ.get('NEAR_DUPLICATE_REUSE_SIMILARITY', '0'))
+
+# Per-client token buckets for the analysis APIs, as "<requests>/<seconds>" ("0" disables one).
+# Clients are keyed by their session user id, or else by their address.
+RATE_LIMIT_ANALYZE = os.environ.get('RATE_LIMIT_ANALYZE', '60/60')
+RATE_LIMIT_ANALYZE_BATCH = os.environ.get('RATE_LIMIT_ANALYZE_BATCH', '10/60')
+RATE_LIMIT_ANALYZE_STREAM = os.environ.get('RATE_LIMIT_ANALYZE_STREAM', '5/60')
+RATE_LIMIT_PREDICT = os.environ.get('RATE_LIMIT_PREDICT', '120/60')
+# 'memory' keeps the buckets per process; 'sqlite' shares them between the workers on one machine
+RATE_LIMIT_STORE = os.environ.get('RATE_LIMIT_STORE', 'memory').lower()
+RATE_LIMIT_DB_PATH = os.environ.get('RATE_LIMIT_DB_PATH', os.path.join(DATABASE_DIR, 'ratelimit.db'))
+
+# Analysis history writes are queued and committed in batches
+ANALYSIS_WRITE_BATCH_SIZE = max(1, int(os.environ.get('ANALYSIS_WRITE_BATCH_SIZE', '256')))
+ANALYSIS_WRITE_INTERVAL = float(os.environ.get('ANALYSIS_WRITE_INTERVAL', '0.05'))
+HISTORY_PAGE_SIZE = 50
+HISTORY_MAX_PAGE_SIZE = 500
+# Storage budget for the analysis history (MiB); the oldest analyses are pruned beyond it, 0 keeps everything
+HISTORY_MAX_MB = float(os.environ.get('HISTORY_MAX_MB', '0'))
+# Descriptions at least this long (bytes) are stored zlib-compressed
+HISTORY_COMPRESS_MIN_BYTES = int(os.environ.get('HISTORY_COMPRESS_MIN_BYTES', '256'))
+
+# Idle SQLite connections kept per process for request handlers; busy periods open extra ones
+DB_POOL_SIZE = max(1, int(os.environ.get('DB_POOL_SIZE', '8')))
+# Per-connection page cache (KiB) and memory-mapped I/O window (bytes)
+SQLITE_CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB', '8192'))
+SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', str(64 * 1024 * 1024)))
+
+# Rolling windows reported by /api/stats
+STATS_MINUTE_WINDOW = 60
+STATS_HOUR_WINDOW = 24
+STATS_MINUTE_RETENTION_HOURS = 24
+
 os.makedirs(MODELS_DIR, exist_ok=True)
 os.makedirs(DATABASE_DIR, exist_ok=True)
 
 # ------------------------------------------------------------------------------
-# Simple in-memory store for job analysis history
+# Logging
+# ------------------------------------------------------------------------------
+
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text').lower()  # 'text' or 'json'
+# Fraction of model predictions logged at DEBUG with their features and probabilities
+PREDICTION_LOG_SAMPLE_RATE = float(os.environ.get('PREDICTION_LOG_SAMPLE_RATE', '0.01'))
+
+class LogFormatter(logging.Formatter):
+    """One line per record; structured fields passed as extra={'fields': {...}} are appended"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = getattr(record, 'fields', None) or {}
+        if LOG_FORMAT == 'json':
+            entry = {
+                'time': datetime.fromtimestamp(record.created).isoformat(),
+                'level': record.levelname,
+                'logger': record.name,
+                'message': record.getMessage(),
+                **fields
+            }
+            if record.exc_info:
+                entry['exception'] = self.formatException(record.exc_info)
+            return json.dumps(entry, default=str)
+
+        line = super().format(record)
+        if fields:
+            line += ' ' + ' '.join(f'{key}={value}' for key, value in fields.items())
+        return line
+
+def _configure_logging() -> logging.Logger:
+    """Records are only put on a queue in the calling thread; a listener thread writes them out"""
+    log = logging.getLogger('legitmate')
+    log.setLevel(LOG_LEVEL)
+    log.propagate = False
+    if log.handlers:
+        return log
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(LogFormatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    # The listener thread does not survive a fork (gunicorn preload), so start a new one in the child
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=listener.start)
+    log.addHandler(logging.handlers.QueueHandler(log_queue))
+    return log
+
+logger = _configure_logging()
+
 # ------------------------------------------------------------------------------
+# Metrics (Prometheus text format at /api/metrics)
+# ------------------------------------------------------------------------------
+
+LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Stripes per metric; threads are dealt out round-robin so concurrent updates rarely share a lock
+METRIC_STRIPES = 16
+_stripe_ids = itertools.count()
+_thread_stripe = threading.local()
+
+def _current_stripe() -> int:
+    stripe = getattr(_thread_stripe, 'index', None)
+    if stripe is None:
+        stripe = _thread_stripe.index = next(_stripe_ids) % METRIC_STRIPES
+    return stripe
+
+class _StripedValues:
+    """Fixed-size list of numbers split over METRIC_STRIPES stripes, each with its own lock.
+
+    Updates only lock the calling thread's stripe, and the stripes are summed when metrics
+    are scraped. The stripe count is fixed, so short-lived request threads cost nothing.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._stripes = [(threading.Lock(), [0.0] * size) for _ in range(METRIC_STRIPES)]
+
+    def stripe(self) -> Tuple[threading.Lock, list]:
+        return self._stripes[_current_stripe()]
+
+    def totals(self) -> list:
+        totals = [0.0] * self.size
+        for lock, values in self._stripes:
+            with lock:
+                totals = [total + value for total, value in zip(totals, values)]
+        return totals
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._children: Dict[tuple, _StripedValues] = {}
+        self._lock = threading.Lock()
+        METRICS.append(self)
+
+    def _values(self, labelvalues: tuple) -> _StripedValues:
+        values = self._children.get(labelvalues)
+        if values is None:
+            with self._lock:
+                values = self._children.setdefault(labelvalues, _StripedValues(self._slots()))
+        return values
+
+    def _slots(self) -> int:
+        return 1
+
+    def _labels(self, labelvalues: tuple, extra: str = '') -> str:
+        pairs = [f'{k}="{str(v)}"' for k, v in zip(self.labelnames, labelvalues)]
+        if extra:
+            pairs.append(extra)
+        return '{' + ','.join(pairs) + '}' if pairs else ''
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            children = sorted(self._children.items())
+        for labelvalues, values in children:
+            lines.extend(self._render_child(labelvalues, values.totals()))
+        return lines
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        lock, values = self._values(labelvalues).stripe()
+        with lock:
+            values[0] += amount
+
+    def _render_child(self, labelvalues: tuple, totals: list) -> List[str]:
+        return [f'{self.name}{self._labels(labelvalues)} {totals[0]:g}']
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        super().__init__(name, documentation, labelnames)
+
+    def _slots(self) -> int:
+        # One count per bucket, then the +Inf count and the sum
+        return len(self.buckets) + 2
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        lock, values = self._values(labelvalues).stripe()
+        with lock:
+            values[index] += 1
+            values[-1] += value
+
+    def _render_child(self, labelvalues: tuple, totals: list) -> List[str]:
+        lines, cumulative = [], 0.0
+        for bound, count in zip(self.buckets, totals):
+            cumulative += count
+            le = 'le="%g"' % bound
+            lines.append(f'{self.name}_bucket{self._labels(labelvalues, le)} {cumulative:g}')
+        cumulative += totals[len(self.buckets)]
+        le = 'le="+Inf"'
+        lines.append(f'{self.name}_bucket{self._labels(labelvalues, le)} {cumulative:g}')
+        lines.append(f'{self.name}_sum{self._labels(labelvalues)} {totals[-1]:.9g}')
+        lines.append(f'{self.name}_count{self._labels(labelvalues)} {cumulative:g}')
+        return lines
+
+METRICS: List[_Metric] = []
+
+ANALYSIS_STAGE_SECONDS = Histogram(
+    'legitmate_analysis_stage_seconds', 'Time spent in each stage of job description analysis.', ('stage', 'mode')
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    'legitmate_http_request_duration_seconds', 'HTTP request latency by route.', ('route', 'method', 'status')
+)
+MODEL_FAILURES = Counter(
+    'legitmate_model_failures_total', 'Model predictions that raised an exception.', ('mode',)
+)
+INFERENCE_REJECTED = Counter(
+    'legitmate_inference_rejected_total', 'Inference calls shed because the queue was full or they timed out.', ('reason',)
+)
+MICRO_BATCH_SIZE = Histogram(
+    'legitmate_micro_batch_size', 'Rows per coalesced predict_proba call.', (),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)
+)
+RULE_BASED_FALLBACKS = Counter(
+    'legitmate_rule_based_fallbacks_total', 'Analyses answered with "Rule-based only".', ('reason',)
+)
+RATE_LIMITED = Counter(
+    'legitmate_rate_limited_total', 'Requests answered 429 by the per-client rate limiter.', ('endpoint',)
+)
+NEAR_DUPLICATE_LOOKUPS = Counter(
+    'legitmate_near_duplicate_lookups_total',
+    'Near-duplicate index lookups: new postings, similar to prior scams, or answered from a near-identical one.',
+    ('outcome',)
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    'legitmate_password_hash_seconds', 'Time spent hashing or checking a password.', ('operation',)
+)
+PASSWORD_HASH_REJECTED = Counter(
+    'legitmate_password_hash_rejected_total', 'Password hashing calls shed because the queue was full or they timed out.',
+    ('reason',)
+)
+UNKNOWN_EMAIL_CACHE_HITS = Counter(
+    'legitmate_unknown_email_cache_hits_total', 'User lookups answered by the unknown-email cache.', ()
+)
 
-job_database = []
+# ------------------------------------------------------------------------------
+# Scam keyword lists
+# ------------------------------------------------------------------------------
 
 SCAM_INDICATORS = [
     'urgent hiring', 'work from home', 'no experience needed', 'high salary',
@@ -77,28 +429,293 @@ SCAM_INDICATORS = [
     'consulting', 'freelance', 'contract work', 'temporary', 'seasonal'
 ]
 
-def analyze_job_description(description: str):
-    if not description or len(description.strip()) < 10:
-        return {
-            'is_scam': True,
-            'confidence': 0.9,
-            'reasons': ['Job description is too short or empty'],
-            'risk_level': 'High',
-            'ml_confidence': 0.0,
-            'rule_based_confidence': 0.9
-        }
+# Extra rule-based keyword groups
+RULE_URGENT_WORDS = ['urgent', 'immediate', 'asap', 'quick', 'fast', 'hurry']
+RULE_UNREALISTIC_WORDS = ['guaranteed', 'promise', 'sure', 'certain', 'definite']
+RULE_PAYMENT_WORDS = ['pay', 'fee', 'cost', 'charge', 'payment', 'money']
+
+# Keyword groups used by the ML features - must match training features
+FEATURE_URGENT_WORDS = ['urgent', 'immediate', 'asap', 'quick', 'fast', 'hurry', 'now']
+FEATURE_MONEY_WORDS = ['salary', 'pay', 'money', 'income', 'earn', 'profit', 'cash', 'guaranteed', 'promise']
+FEATURE_WFH_WORDS = ['remote', 'work from home', 'home based', 'telecommute', 'online']
+FEATURE_SUSPICIOUS_WORDS = ['investment', 'cryptocurrency', 'bitcoin', 'multi-level', 'pyramid', 'commission only']
+FEATURE_SCAM_PHRASES = [
+    'no experience needed', 'work from home', 'high salary', 'quick money',
+    'easy money', 'get rich quick', 'pay upfront', 'registration fee',
+    'processing fee', 'guaranteed income', 'unlimited earning',
+    'no interview required', 'immediate start'
+]
 
-    description_lower = description.lower()
+class KeywordMatcher:
+    """Finds the keywords of every category in lowercased text, sharing the work across categories.
+
+    Keywords are deduplicated once at startup. On long texts, whitespace-free keywords are
+    looked up in the text's deduplicated vocabulary instead of the full text, and phrases are
+    only scanned for when their longest word shows up there. Results keep the plain
+    `keyword in text` substring semantics, in category list order.
+    """
+
+    # Below this length scanning the text directly is cheaper than building the vocabulary
+    VOCABULARY_MIN_CHARS = 1024
+
+    def __init__(self, categories: Dict[str, List[str]]):
+        self.categories = {name: list(words) for name, words in categories.items()}
+        keywords = list(dict.fromkeys(w for words in self.categories.values() for w in words))
+        self.keywords = keywords
+        self.words = [k for k in keywords if not any(c.isspace() for c in k)]
+        self.phrases = [(k, max(k.split(), key=len)) for k in keywords if any(c.isspace() for c in k)]
+
+    def _found_keywords(self, text_lower: str, words: Optional[List[str]]) -> set:
+        if len(text_lower) < self.VOCABULARY_MIN_CHARS:
+            return {k for k in self.keywords if k in text_lower}
+
+        vocabulary = '\n'.join(set(text_lower.split() if words is None else words))
+        found = {k for k in self.words if k in vocabulary}
+        found.update(k for k, longest_word in self.phrases if longest_word in vocabulary and k in text_lower)
+        return found
+
+    def match(self, text_lower: str, words: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """words can pass in text_lower.split() when the caller already has it."""
+        found = self._found_keywords(text_lower, words)
+        return {name: [w for w in words if w in found] for name, words in self.categories.items()}
+
+KEYWORD_MATCHER = KeywordMatcher({
+    'scam_indicators': SCAM_INDICATORS,
+    'rule_urgent': RULE_URGENT_WORDS,
+    'rule_unrealistic': RULE_UNREALISTIC_WORDS,
+    'rule_payment': RULE_PAYMENT_WORDS,
+    'feature_urgent': FEATURE_URGENT_WORDS,
+    'feature_money': FEATURE_MONEY_WORDS,
+    'feature_wfh': FEATURE_WFH_WORDS,
+    'feature_suspicious': FEATURE_SUSPICIOUS_WORDS,
+    'feature_scam_phrases': FEATURE_SCAM_PHRASES
+})
+
+def scan_text(text: str) -> Dict[str, Any]:
+    """Lower-case and tokenize a description once for both the rules and the model features.
+
+    Whitespace has no case, so the word count of the lowercased text is the word count of
+    the original.
+    """
+    text_lower = text.lower()
+    words = text_lower.split()
+    return {'word_count': len(words), 'keyword_hits': KEYWORD_MATCHER.match(text_lower, words)}
+
+# ------------------------------------------------------------------------------
+# Analysis result cache
+# ------------------------------------------------------------------------------
+
+class AnalysisCache:
+    """Bounded LRU + TTL cache of analysis results keyed on a hash of the description.
+
+    The key hashes the description exactly as analyzed (routes already strip surrounding
+    whitespace): every feature, down to the caps ratio, depends on the exact text.
+    invalidate() drops everything and bumps the generation, so results computed against
+    a previous model are never stored afterwards.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(description: str) -> bytes:
+        return hashlib.sha256(description.encode('utf-8', 'surrogatepass')).digest()
+
+    def get(self, key: bytes) -> Optional[dict]:
+        if self.maxsize <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        result = entry[1]
+        return dict(result, reasons=list(result['reasons']))
+
+    def put(self, key: bytes, result: dict, generation: int) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, dict(result, reasons=list(result['reasons'])))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.maxsize > 0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'generation': self.generation
+            }
+
+ANALYSIS_CACHE = AnalysisCache(ANALYSIS_CACHE_SIZE, ANALYSIS_CACHE_TTL)
+
+# ------------------------------------------------------------------------------
+# Near-duplicate index
+# ------------------------------------------------------------------------------
 
+class NearDuplicateIndex:
+    """MinHash/LSH index of recently analyzed descriptions, for spotting lightly edited variants.
+
+    Descriptions are shingled into overlapping word n-grams and MinHashed into num_perm
+    32-bit values. Signatures live in one preallocated NumPy array used as a ring buffer, so
+    once capacity entries are indexed the oldest is overwritten. Each signature is also cut
+    into bands, and only entries sharing at least one band hash with the query are compared.
+    Band hashes are found with a vectorized scan of a compact bands x capacity array rather
+    than per-band hash tables, which would cost far more memory per entry. Word hashes come from hash(), so
+    signatures are only comparable within one process.
+
+    Entries are also keyed by the exact text (AnalysisCache.key_for), so resubmitting a posting
+    refreshes its entry instead of adding another, and a posting never counts as similar to itself.
+    """
+
+    def __init__(self, capacity: int, num_perm: int = 64, bands: int = 16, shingle_size: int = 2,
+                 store_results: bool = False):
+        self.capacity = capacity
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.store_results = store_results
+        self.size = 0
+        self._next = 0
+        self._slots_by_key: Dict[bytes, int] = {}
+        self._keys: List[Optional[bytes]] = [None] * capacity
+        self._lock = threading.Lock()
+        self._ready = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def _ensure_arrays(self) -> None:
+        # Allocated on first use so importing the app doesn't pull in numpy
+        if self._ready:
+            return
+        with self._lock:
+            if self._ready:
+                return
+            rng = np.random.default_rng(20240601)
+            # Multiply-shift hashing: the top 32 bits of (a * x + b) mod 2**64, a odd
+            self._mul = (rng.integers(0, 2 ** 63, self.num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1))[:, None]
+            self._add = rng.integers(0, 2 ** 63, self.num_perm, dtype=np.uint64)[:, None]
+            self._signatures = np.zeros((self.capacity, self.num_perm), dtype=np.uint32)
+            # Band-major, so matching one band is a contiguous scan
+            self._band_keys = np.zeros((self.bands, self.capacity), dtype=np.uint32)
+            self._is_scam = np.zeros(self.capacity, dtype=bool)
+            self._generations = np.full(self.capacity, -1, dtype=np.int64)
+            self._results: List[Optional[dict]] = [None] * self.capacity if self.store_results else []
+            self._ready = True
+
+    def signature(self, text: str) -> np.ndarray:
+        self._ensure_arrays()
+        hashes = np.array([hash(word) for word in text.lower().split()] or [0], dtype=np.int64).view(np.uint64)
+        k = min(self.shingle_size, len(hashes))
+        count = len(hashes) - k + 1
+        shingles = hashes[:count].copy()
+        for offset in range(1, k):
+            shingles = shingles * np.uint64(0x9E3779B97F4A7C15) + hashes[offset:offset + count]
+        return ((self._mul * shingles + self._add) >> np.uint64(32)).min(axis=1).astype(np.uint32)
+
+    def _band_keys_of(self, signature: np.ndarray) -> np.ndarray:
+        rows = signature.reshape(self.bands, self.rows).astype(np.uint64)
+        keys = rows[:, 0]
+        for row in range(1, self.rows):
+            keys = keys * np.uint64(0x100000001B3) + rows[:, row]
+        return ((keys ^ (keys >> np.uint64(32))) & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+    def match(self, signature: np.ndarray, min_similarity: float, reuse_similarity: float,
+              generation: int, key: Optional[bytes] = None) -> dict:
+        """Count other indexed scams at least min_similarity alike (estimated Jaccard of shingles).
+
+        The entry for the same text (key) is not counted. 'reusable' is the stored result of the
+        closest entry when it is at least reuse_similarity alike and was analyzed under the
+        current cache generation (model).
+        """
+        keys = self._band_keys_of(signature)
+        with self._lock:
+            if self.size == 0:
+                return {'similar_scams': 0, 'similarity': 0.0, 'reusable': None}
+            candidates = np.unique(np.concatenate([
+                np.flatnonzero(self._band_keys[band, :self.size] == key) for band, key in enumerate(keys)
+            ]))
+            similarity = (self._signatures[candidates] == signature).mean(axis=1)
+            similar = candidates[similarity >= min_similarity]
+            own_slot = self._slots_by_key.get(key) if key is not None else None
+            if own_slot is not None:
+                similar = similar[similar != own_slot]
+            similar_scams = int(self._is_scam[similar].sum())
+            best_similarity, reusable = 0.0, None
+            if len(candidates):
+                best = int(similarity.argmax())
+                best_similarity = float(similarity[best])
+                slot = int(candidates[best])
+                if self.store_results and 0 < reuse_similarity <= best_similarity \
+                        and self._generations[slot] == generation:
+                    reusable = self._results[slot]
+        return {'similar_scams': similar_scams, 'similarity': best_similarity, 'reusable': reusable}
+
+    def add(self, signature: np.ndarray, result: dict, generation: int, key: Optional[bytes] = None) -> None:
+        keys = self._band_keys_of(signature)
+        with self._lock:
+            slot = self._slots_by_key.get(key) if key is not None else None
+            if slot is None:
+                slot = self._next
+                self._next = (slot + 1) % self.capacity
+                self.size = min(self.size + 1, self.capacity)
+                evicted = self._keys[slot]
+                if evicted is not None:
+                    del self._slots_by_key[evicted]
+                self._keys[slot] = key
+                if key is not None:
+                    self._slots_by_key[key] = slot
+            self._signatures[slot] = signature
+            self._band_keys[:, slot] = keys
+            self._is_scam[slot] = bool(result['is_scam'])
+            self._generations[slot] = generation
+            if self.store_results:
+                self._results[slot] = result
+
+NEAR_DUPLICATES = NearDuplicateIndex(NEAR_DUPLICATE_INDEX_SIZE, store_results=NEAR_DUPLICATE_REUSE_SIMILARITY > 0)
+
+# ------------------------------------------------------------------------------
+# Job description analysis
+# ------------------------------------------------------------------------------
+
+def _rule_based_analysis(scan: Dict[str, Any]) -> dict:
     # Rule-based
-    scam_count = 0
-    found_indicators = []
-    for indicator in SCAM_INDICATORS:
-        if indicator in description_lower:
-            scam_count += 1
-            found_indicators.append(indicator)
-
-    total_words = len(description.split())
+    keyword_hits = scan['keyword_hits']
+    found_indicators = keyword_hits['scam_indicators']
+    scam_count = len(found_indicators)
+
+    total_words = scan['word_count']
     scam_ratio = scam_count / max(total_words, 1)
 
     if scam_ratio > 0.1 or scam_count > 5:
@@ -119,56 +736,50 @@ def analyze_job_description(description: str):
         rule_confidence = 0.1
 
     additional_reasons = []
-    urgent_words = ['urgent', 'immediate', 'asap', 'quick', 'fast', 'hurry']
-    if sum(1 for w in urgent_words if w in description_lower) > 2:
+    if len(keyword_hits['rule_urgent']) > 2:
         additional_reasons.append('Contains multiple urgent/desperate language')
         rule_confidence = min(0.95, rule_confidence + 0.2)
 
-    unrealistic_words = ['guaranteed', 'promise', 'sure', 'certain', 'definite']
-    if sum(1 for w in unrealistic_words if w in description_lower) > 1:
+    if len(keyword_hits['rule_unrealistic']) > 1:
         additional_reasons.append('Contains unrealistic guarantees')
         rule_confidence = min(0.95, rule_confidence + 0.15)
 
-    payment_words = ['pay', 'fee', 'cost', 'charge', 'payment', 'money']
-    if sum(1 for w in payment_words if w in description_lower) > 2:
+    if len(keyword_hits['rule_payment']) > 2:
         additional_reasons.append('Mentions payment requirements')
         rule_confidence = min(0.95, rule_confidence + 0.25)
 
-    # ML Model analysis
-    ml_confidence = 0.0
-    ml_is_scam = False
-    if MODEL is not None:
-        try:
-            text_features = extract_text_features(description)
-            print(f"Extracted features: {text_features}")
-            
-            if hasattr(MODEL, 'predict_proba'):
-                proba = MODEL.predict_proba([text_features])
-                print(f"Model probabilities: {proba[0]}")
-                ml_confidence = float(proba[0][1])  # probability of scam (class 1)
-                ml_is_scam = ml_confidence > 0.5
-                print(f"ML confidence: {ml_confidence}, ML is_scam: {ml_is_scam}")
-            elif hasattr(MODEL, 'predict'):
-                prediction = MODEL.predict([text_features])[0]
-                ml_is_scam = bool(prediction)
-                ml_confidence = 0.8 if ml_is_scam else 0.2
-                print(f"ML prediction: {prediction}, ML is_scam: {ml_is_scam}")
-        except Exception as e:
-            print(f"ML model prediction failed: {e}")
-            import traceback
-            traceback.print_exc()
-            ml_confidence = 0.0
-            ml_is_scam = False
+    return {
+        'scam_count': scam_count,
+        'found_indicators': found_indicators,
+        'total_words': total_words,
+        'rule_is_scam': rule_is_scam,
+        'rule_confidence': rule_confidence,
+        'additional_reasons': additional_reasons
+    }
+
+def _short_description_result() -> dict:
+    return {
+        'is_scam': True,
+        'confidence': 0.9,
+        'reasons': ['Job description is too short or empty'],
+        'risk_level': 'High',
+        'ml_confidence': 0.0,
+        'rule_based_confidence': 0.9
+    }
+
+def _combine_analysis(rule: dict, ml_confidence: float, has_model: bool) -> dict:
+    rule_confidence = rule['rule_confidence']
 
     # Combine
-    if MODEL is not None and ml_confidence > 0:
+    if has_model and ml_confidence > 0:
         combined_confidence = (0.6 * ml_confidence) + (0.4 * rule_confidence)
         is_scam = combined_confidence > 0.5
         confidence_source = "Combined ML + Rule-based"
     else:
         combined_confidence = rule_confidence
-        is_scam = rule_is_scam
+        is_scam = rule['rule_is_scam']
         confidence_source = "Rule-based only"
+        RULE_BASED_FALLBACKS.inc('no_model' if not has_model else 'no_ml_confidence')
 
     if combined_confidence > 0.8:
         risk_level = 'Very High'
@@ -181,8 +792,8 @@ def analyze_job_description(description: str):
     else:
         risk_level = 'Very Low'
 
-    all_reasons = (found_indicators[:3] + additional_reasons)
-    if MODEL is not None:
+    all_reasons = (rule['found_indicators'][:3] + rule['additional_reasons'])
+    if has_model:
         all_reasons.append(f"ML model confidence: {ml_confidence:.2f}")
 
     return {
@@ -190,28 +801,312 @@ def analyze_job_description(description: str):
         'confidence': round(combined_confidence, 3),
         'reasons': all_reasons,
         'risk_level': risk_level,
-        'scam_indicators_found': scam_count,
-        'total_words': total_words,
+        'scam_indicators_found': rule['scam_count'],
+        'total_words': rule['total_words'],
         'ml_confidence': round(ml_confidence, 3),
         'rule_based_confidence': round(rule_confidence, 3),
         'confidence_source': confidence_source
     }
 
+def analyze_job_description(description: str):
+    if not description or len(description.strip()) < 10:
+        return _short_description_result()
+
+    cache_key = AnalysisCache.key_for(description)
+    cached = ANALYSIS_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+    generation = ANALYSIS_CACHE.generation
+
+    # Don't score with rules only just because the warm-up hasn't finished yet
+    wait_until_ready(MODEL_READY_TIMEOUT)
+    # Take one reference to the active model so a concurrent swap can't mix two models
+    active = get_active_model()
+    result = _analyze_uncached(description, active.scorer if active is not None else None)
+    ANALYSIS_CACHE.put(cache_key, result, generation)
+    return result
+
+def analyze_with_near_duplicates(description: str) -> dict:
+    """analyze_job_description plus a "similar to N prior scams" signal from NEAR_DUPLICATES.
+
+    Every distinct analyzed posting is added to the index once. A near-identical variant of an indexed
+    posting reuses that posting's result when NEAR_DUPLICATE_REUSE_SIMILARITY is set.
+    """
+    if not NEAR_DUPLICATES.enabled or len(description.strip()) < 10:
+        return analyze_job_description(description)
+
+    started = time.perf_counter()
+    generation = ANALYSIS_CACHE.generation
+    key = AnalysisCache.key_for(description)
+    signature = NEAR_DUPLICATES.signature(description)
+    match = NEAR_DUPLICATES.match(signature, NEAR_DUPLICATE_SIMILARITY, NEAR_DUPLICATE_REUSE_SIMILARITY,
+                                  generation, key)
+    ANALYSIS_STAGE_SECONDS.observe(time.perf_counter() - started, 'near_duplicates', 'single')
+
+    base = match['reusable']
+    if base is not None:
+        NEAR_DUPLICATE_LOOKUPS.inc('reused')
+    else:
+        base = analyze_job_description(description)
+        NEAR_DUPLICATE_LOOKUPS.inc('similar' if match['similar_scams'] else 'new')
+    NEAR_DUPLICATES.add(signature, base, generation, key)
+
+    similar_scams = match['similar_scams']
+    result = dict(base, reasons=list(base['reasons']), similar_prior_scams=similar_scams)
+    if similar_scams:
+        result['reasons'].append(f"Similar to {similar_scams} prior scam posting{'s' if similar_scams != 1 else ''}")
+    if match['reusable'] is not None:
+        result['near_duplicate_similarity'] = round(match['similarity'], 3)
+    return result
+
+def _analyze_uncached(description: str, model: Optional[Any]) -> dict:
+    started = time.perf_counter()
+    scan = scan_text(description)
+    rule = _rule_based_analysis(scan)
+    rules_done = time.perf_counter()
+    ANALYSIS_STAGE_SECONDS.observe(rules_done - started, 'rules', 'single')
+
+    # ML Model analysis
+    ml_confidence = 0.0
+    ml_is_scam = False
+    if model is not None:
+        try:
+            text_features = extract_text_features(description, scan)
+            features_done = time.perf_counter()
+            ANALYSIS_STAGE_SECONDS.observe(features_done - rules_done, 'features', 'single')
+
+            if hasattr(model, 'predict_proba'):
+                proba = MICRO_BATCHER.predict_proba(model, text_features)
+                ml_confidence = float(proba[1])  # probability of scam (class 1)
+                ml_is_scam = ml_confidence > 0.5
+            elif hasattr(model, 'predict'):
+                prediction = model.predict([text_features])[0]
+                ml_is_scam = bool(prediction)
+                ml_confidence = 0.8 if ml_is_scam else 0.2
+            ANALYSIS_STAGE_SECONDS.observe(time.perf_counter() - features_done, 'model', 'single')
+
+            if PREDICTION_LOG_SAMPLE_RATE > 0 and random.random() < PREDICTION_LOG_SAMPLE_RATE \
+                    and logger.isEnabledFor(logging.DEBUG):
+                logger.debug('ML prediction', extra={'fields': {
+                    'features': text_features, 'ml_confidence': ml_confidence, 'ml_is_scam': ml_is_scam
+                }})
+        except Exception:
+            logger.exception('ML model prediction failed')
+            MODEL_FAILURES.inc('single')
+            ml_confidence = 0.0
+            ml_is_scam = False
+
+    return _combine_analysis(rule, ml_confidence, model is not None)
+
+def _batch_ml_confidences(model: Any, feature_matrix: np.ndarray) -> np.ndarray:
+    """Score a whole feature matrix with one model call per chunk."""
+    confidences = np.zeros(len(feature_matrix), dtype=float)
+    for start in range(0, len(feature_matrix), ANALYZE_BATCH_CHUNK_SIZE):
+        chunk = feature_matrix[start:start + ANALYZE_BATCH_CHUNK_SIZE]
+        if hasattr(model, 'predict_proba'):
+            confidences[start:start + len(chunk)] = model.predict_proba(chunk)[:, 1]
+        elif hasattr(model, 'predict'):
+            predictions = model.predict(chunk)
+            confidences[start:start + len(chunk)] = [0.8 if bool(p) else 0.2 for p in predictions]
+    return confidences
+
+def analyze_job_descriptions(descriptions: List[str]) -> List[dict]:
+    """Batch version of analyze_job_description - same per-item results, vectorized model scoring"""
+    results: List[Optional[dict]] = [None] * len(descriptions)
+    generation = ANALYSIS_CACHE.generation
+    wait_until_ready(MODEL_READY_TIMEOUT)
+    active = get_active_model()
+    model = active.scorer if active is not None else None
+    cache_keys = {}
+    rules = {}
+    scans = {}
+    started = time.perf_counter()
+    for i, description in enumerate(descriptions):
+        if not description or len(description.strip()) < 10:
+            results[i] = _short_description_result()
+            continue
+        cache_keys[i] = AnalysisCache.key_for(description)
+        results[i] = ANALYSIS_CACHE.get(cache_keys[i])
+        if results[i] is None:
+            scans[i] = scan_text(description)
+            rules[i] = _rule_based_analysis(scans[i])
+
+    rules_done = time.perf_counter()
+    ANALYSIS_STAGE_SECONDS.observe(rules_done - started, 'rules', 'batch')
+
+    indices = list(rules)
+    ml_confidences = np.zeros(len(indices), dtype=float)
+    if model is not None and indices:
+        try:
+            feature_matrix = np.array(
+                [extract_text_features(descriptions[i], scans[i]) for i in indices], dtype=float
+            )
+            features_done = time.perf_counter()
+            ANALYSIS_STAGE_SECONDS.observe(features_done - rules_done, 'features', 'batch')
+            ml_confidences = _batch_ml_confidences(model, feature_matrix)
+            ANALYSIS_STAGE_SECONDS.observe(time.perf_counter() - features_done, 'model', 'batch')
+        except Exception:
+            logger.exception('ML model batch prediction failed')
+            MODEL_FAILURES.inc('batch')
+            ml_confidences = np.zeros(len(indices), dtype=float)
+
+    for i, ml_confidence in zip(indices, ml_confidences):
+        results[i] = _combine_analysis(rules[i], float(ml_confidence), model is not None)
+        ANALYSIS_CACHE.put(cache_keys[i], results[i], generation)
+    return results
+
+# ------------------------------------------------------------------------------
+# Streaming bulk scoring
+# ------------------------------------------------------------------------------
+
+def iter_postings(lines: Iterable[str], fmt: str = 'ndjson') -> Iterator[dict]:
+    """Parse NDJSON or CSV postings lazily.
+
+    Every item has an 'id' (the input's own id, else its line/row number) and either a
+    'description' or an 'error', so bad lines are reported in place instead of aborting.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(lines)
+        if not reader.fieldnames or 'description' not in reader.fieldnames:
+            yield {'id': None, 'error': 'CSV input needs a description column'}
+            return
+        for number, row in enumerate(reader, start=1):
+            yield {'id': row.get('id') or number, 'description': row.get('description') or ''}
+        return
+
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError:
+            yield {'id': number, 'error': 'Invalid JSON'}
+            continue
+        if isinstance(item, str):
+            yield {'id': number, 'description': item}
+        elif isinstance(item, dict) and isinstance(item.get('description'), str):
+            yield {'id': item.get('id', number), 'description': item['description']}
+        else:
+            yield {'id': number, 'error': 'Expected a JSON object with a description string'}
+
+def _chunked(items: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def score_posting_chunk(chunk: List[dict]) -> List[dict]:
+    # Pool workers started with 'spawn' import the app afresh and must finish loading the model
+    wait_until_ready()
+    valid = [p for p in chunk if 'error' not in p]
+    results = iter(analyze_job_descriptions([p['description'].strip() for p in valid]))
+    return [p if 'error' in p else {'id': p['id'], 'result': next(results)} for p in chunk]
+
+def score_postings(postings: Iterable[dict], chunk_size: int = STREAM_CHUNK_SIZE, processes: int = 1,
+                   score_chunk=score_posting_chunk) -> Iterator[dict]:
+    """Score postings chunk by chunk and yield results in input order.
+
+    Only a few chunks are held at a time, so memory stays flat whatever the input size.
+    With processes > 1 chunks are scored by a multiprocessing pool, at most two per
+    process in flight.
+    """
+    chunks = _chunked(postings, chunk_size)
+    if processes <= 1:
+        for chunk in chunks:
+            yield from score_chunk(chunk)
+        return
+
+    import multiprocessing
+
+    # Forking while the warm-up thread is mid-import would leave its import locks held in
+    # the children; let it finish so they also inherit the loaded model
+    wait_until_ready()
+    with multiprocessing.Pool(processes) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.apply_async(score_chunk, (chunk,)))
+            if len(pending) >= processes * 2:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
 # ------------------------------------------------------------------------------
 # SQLite helpers
 # ------------------------------------------------------------------------------
 
+def configure_connection(db: sqlite3.Connection) -> sqlite3.Connection:
+    # NORMAL is durable enough under WAL: a power loss can only drop the last commits
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+    db.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    db.execute("PRAGMA temp_store=MEMORY")
+    return db
+
+class ConnectionPool:
+    """Per-process pool of configured SQLite connections, reused across requests.
+
+    A reused connection keeps its page cache and sqlite3's cache of prepared statements,
+    so hot queries skip both the connect and the re-prepare. acquire() never blocks: when
+    no idle connection is left it opens a new one, and release() closes connections beyond
+    size. Idle connections are closed before a fork and never handed out in a child.
+    """
+
+    def __init__(self, db_path: str, size: int):
+        self.db_path = db_path
+        self.size = size
+        self._idle: List[sqlite3.Connection] = []
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+        db.row_factory = sqlite3.Row
+        return configure_connection(db)
+
+    def acquire(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._pid != os.getpid():
+                # Connections opened by the parent must not be used (or closed) here
+                self._idle = []
+                self._pid = os.getpid()
+            if self._idle:
+                return self._idle.pop()
+        return self._connect()
+
+    def release(self, db: sqlite3.Connection) -> None:
+        if db.in_transaction:
+            db.rollback()
+        with self._lock:
+            if self._pid == os.getpid() and len(self._idle) < self.size:
+                self._idle.append(db)
+                return
+        db.close()
+
+    def close_idle(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for db in idle:
+            db.close()
+
+DB_POOL = ConnectionPool(DATABASE_PATH, DB_POOL_SIZE)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(before=DB_POOL.close_idle)
+
 def get_db():
     if 'db' not in g:
-        g.db = sqlite3.connect(DATABASE_PATH, check_same_thread=False)
-        g.db.row_factory = sqlite3.Row
+        g.db = DB_POOL.acquire()
     return g.db
 
 @app.teardown_appcontext
 def close_db(exc):
     db = g.pop('db', None)
     if db is not None:
-        db.close()
+        DB_POOL.release(db)
 
 def initialize_database() -> None:
     db = get_db()
@@ -223,72 +1118,629 @@ def initialize_database() -> None:
             created_at TEXT NOT NULL
         );
     """)
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS analyses (
+            seq INTEGER PRIMARY KEY,
+            id TEXT UNIQUE NOT NULL,
+            description TEXT NOT NULL,
+            analysis TEXT NOT NULL,
+            is_scam INTEGER NOT NULL,
+            confidence REAL NOT NULL,
+            risk_level TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            user_ip TEXT,
+            description_hash BLOB
+        );
+    """)
+    # Analyses recorded before description_texts existed keep their text inline in description
+    columns = {row['name'] for row in db.execute("PRAGMA table_info(analyses)")}
+    if 'description_hash' not in columns:
+        db.execute("ALTER TABLE analyses ADD COLUMN description_hash BLOB")
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS description_texts (
+            hash BLOB PRIMARY KEY,
+            body NOT NULL
+        ) WITHOUT ROWID;
+    """)
+    db.execute("CREATE INDEX IF NOT EXISTS idx_analyses_timestamp ON analyses (timestamp)")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_analyses_description_hash ON analyses (description_hash)")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_analyses_is_scam ON analyses (is_scam)")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_analyses_risk_level ON analyses (risk_level)")
+
+    # Running aggregates for /api/stats, kept up to date by a trigger on analyses
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS analysis_totals (
+            risk_level TEXT PRIMARY KEY,
+            total INTEGER NOT NULL,
+            scam_count INTEGER NOT NULL,
+            confidence_sum REAL NOT NULL
+        );
+    """)
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS analysis_buckets (
+            granularity TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            total INTEGER NOT NULL,
+            scam_count INTEGER NOT NULL,
+            confidence_sum REAL NOT NULL,
+            PRIMARY KEY (granularity, bucket)
+        );
+    """)
+    db.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_analyses_aggregate AFTER INSERT ON analyses
+        BEGIN
+            INSERT INTO analysis_totals (risk_level, total, scam_count, confidence_sum)
+            VALUES (NEW.risk_level, 1, NEW.is_scam, NEW.confidence)
+            ON CONFLICT (risk_level) DO UPDATE SET
+                total = total + 1,
+                scam_count = scam_count + excluded.scam_count,
+                confidence_sum = confidence_sum + excluded.confidence_sum;
+            INSERT INTO analysis_buckets (granularity, bucket, total, scam_count, confidence_sum)
+            VALUES ('minute', substr(NEW.timestamp, 1, 16), 1, NEW.is_scam, NEW.confidence)
+            ON CONFLICT (granularity, bucket) DO UPDATE SET
+                total = total + 1,
+                scam_count = scam_count + excluded.scam_count,
+                confidence_sum = confidence_sum + excluded.confidence_sum;
+            INSERT INTO analysis_buckets (granularity, bucket, total, scam_count, confidence_sum)
+            VALUES ('hour', substr(NEW.timestamp, 1, 13), 1, NEW.is_scam, NEW.confidence)
+            ON CONFLICT (granularity, bucket) DO UPDATE SET
+                total = total + 1,
+                scam_count = scam_count + excluded.scam_count,
+                confidence_sum = confidence_sum + excluded.confidence_sum;
+        END;
+    """)
+    db.commit()
+
+    # Backfill the aggregates once for analyses recorded before they existed
+    db.execute("BEGIN IMMEDIATE")
+    if db.execute("SELECT 1 FROM analysis_totals LIMIT 1").fetchone() is None:
+        db.execute("""
+            INSERT INTO analysis_totals (risk_level, total, scam_count, confidence_sum)
+            SELECT risk_level, COUNT(*), SUM(is_scam), SUM(confidence) FROM analyses GROUP BY risk_level
+        """)
+        for granularity, length in (('minute', 16), ('hour', 13)):
+            db.execute("""
+                INSERT OR REPLACE INTO analysis_buckets (granularity, bucket, total, scam_count, confidence_sum)
+                SELECT ?, substr(timestamp, 1, ?), COUNT(*), SUM(is_scam), SUM(confidence)
+                FROM analyses GROUP BY substr(timestamp, 1, ?)
+            """, (granularity, length, length))
     db.commit()
+    # WAL lets the history writer commit while requests keep reading
+    db.execute("PRAGMA journal_mode=WAL")
+
+class UnknownEmailCache:
+    """Bounded, short-lived set of emails that matched no user.
+
+    Credential-stuffing bursts mostly try emails that don't exist; remembering them for
+    ttl seconds answers the repeats without a query. Registering an email removes it here,
+    but a registration handled by another worker process is only seen once the entry expires.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: 'OrderedDict[str, float]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, email: str) -> bool:
+        if self.maxsize <= 0:
+            return False
+        with self._lock:
+            expires_at = self._entries.get(email)
+            if expires_at is None:
+                return False
+            if expires_at <= time.monotonic():
+                del self._entries[email]
+                return False
+            return True
+
+    def add(self, email: str) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries.pop(email, None)
+            self._entries[email] = time.monotonic() + self.ttl
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, email: str) -> None:
+        with self._lock:
+            self._entries.pop(email, None)
+
+UNKNOWN_EMAILS = UnknownEmailCache(UNKNOWN_EMAIL_CACHE_SIZE, UNKNOWN_EMAIL_CACHE_TTL)
+
+# Kept as constants so every call hits the same entry in the connection's statement cache
+FIND_USER_BY_EMAIL_SQL = "SELECT id, email, password_hash, created_at FROM users WHERE email = ?"
+CREATE_USER_SQL = "INSERT INTO users (email, password_hash, created_at) VALUES (?, ?, ?)"
 
 def find_user_by_email(email: str) -> Optional[sqlite3.Row]:
+    if email in UNKNOWN_EMAILS:
+        UNKNOWN_EMAIL_CACHE_HITS.inc()
+        return None
     db = get_db()
-    cur = db.execute("SELECT * FROM users WHERE email = ?", (email,))
-    return cur.fetchone()
+    cur = db.execute(FIND_USER_BY_EMAIL_SQL, (email,))
+    row = cur.fetchone()
+    if row is None:
+        UNKNOWN_EMAILS.add(email)
+    return row
 
 def create_user(email: str, password: str) -> int:
-    password_hash = generate_password_hash(password)
+    password_hash = hash_password(password)
     db = get_db()
-    cur = db.execute(
-        "INSERT INTO users (email, password_hash, created_at) VALUES (?, ?, ?)",
-        (email, password_hash, datetime.now().isoformat())
-    )
-    db.commit()
+    try:
+        cur = db.execute(CREATE_USER_SQL, (email, password_hash, datetime.now().isoformat()))
+        db.commit()
+    finally:
+        # Also on IntegrityError: the email was just registered elsewhere, so it isn't unknown
+        UNKNOWN_EMAILS.discard(email)
     return cur.lastrowid
 
 def is_valid_email(email: str) -> bool:
     return re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email) is not None
 
+def pack_description(description: str) -> Tuple[bytes, Any]:
+    """-> (content hash, stored body); long descriptions are stored as zlib-compressed BLOBs, short ones as TEXT."""
+    try:
+        data = description.encode('utf-8')
+    except UnicodeEncodeError:
+        # A lone surrogate is valid JSON but not valid UTF-8, which is all SQLite can store;
+        # replace it here rather than fail the writer's batch
+        description = description.encode('utf-8', 'surrogatepass').decode('utf-8', 'replace')
+        data = description.encode('utf-8')
+    key = hashlib.blake2b(data, digest_size=16).digest()
+    if len(data) >= HISTORY_COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(data)
+        if len(compressed) < len(data):
+            return key, compressed
+    return key, description
+
+def unpack_description(body: Any) -> str:
+    return zlib.decompress(body).decode('utf-8') if isinstance(body, bytes) else body
+
+class AnalysisWriter:
+    """Persists analysis records to the analyses table from a background thread.
+
+    Requests only enqueue a row; the writer drains the queue and inserts up to
+    batch_size rows per transaction, waiting at most interval seconds to fill a batch.
+    The thread is started lazily (and again after a fork) on the first submit.
+
+    Each distinct description is stored once in description_texts, keyed by its hash, so
+    reposted scams don't repeat their text. With max_history_bytes set, the oldest analyses
+    are pruned once the database outgrows it.
+    """
+
+    def __init__(self, db_path: str, batch_size: int, interval: float, max_history_bytes: int = 0):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_history_bytes = max_history_bytes
+        self._queue = queue.Queue()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def submit(self, row: tuple) -> None:
+        self._ensure_started()
+        self._queue.put(row)
+
+    def flush(self) -> None:
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            self._queue.join()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._queue = queue.Queue()
+            self._thread = threading.Thread(target=self._run, name='analysis-writer', daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def _run(self) -> None:
+        db = configure_connection(sqlite3.connect(self.db_path, check_same_thread=False))
+        last_prune = 0.0
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._write(db, batch)
+            except Exception:
+                db.rollback()
+                # Every row already has a client holding its id, so keep all rows but the bad one
+                logger.exception('Failed to write %d analyses, retrying one at a time', len(batch))
+                for row in batch:
+                    try:
+                        self._write(db, [row])
+                    except Exception:
+                        db.rollback()
+                        logger.exception('Dropped analysis %s', row[0])
+            try:
+                if time.monotonic() - last_prune > 60:
+                    cutoff = datetime.now() - timedelta(hours=STATS_MINUTE_RETENTION_HOURS)
+                    db.execute(
+                        "DELETE FROM analysis_buckets WHERE granularity = 'minute' AND bucket < ?",
+                        (cutoff.isoformat()[:16],)
+                    )
+                    db.commit()
+                    if self.max_history_bytes > 0:
+                        self._prune_history(db)
+                    last_prune = time.monotonic()
+            except Exception:
+                db.rollback()
+                logger.exception('Failed to prune analysis history')
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    @staticmethod
+    def _write(db: sqlite3.Connection, rows: List[tuple]) -> None:
+        texts = [pack_description(row[1]) for row in rows]
+        db.executemany("INSERT OR IGNORE INTO description_texts (hash, body) VALUES (?, ?)", dict(texts).items())
+        db.executemany(
+            "INSERT INTO analyses "
+            "(id, description, description_hash, analysis, is_scam, confidence, risk_level, timestamp, user_ip) "
+            "VALUES (?, '', ?, ?, ?, ?, ?, ?, ?)",
+            [(row[0], key, *row[2:]) for row, (key, _) in zip(rows, texts)]
+        )
+        db.commit()
+
+    def _prune_history(self, db: sqlite3.Connection) -> None:
+        """Delete the oldest analyses, and the texts only they used, until the database fits the budget.
+
+        Freed pages go back to SQLite's free list and are reused, so the file stops growing
+        rather than shrinking. The /api/stats aggregates are kept.
+        """
+        page_size = db.execute("PRAGMA page_size").fetchone()[0]
+        for _ in range(8):
+            used = (db.execute("PRAGMA page_count").fetchone()[0]
+                    - db.execute("PRAGMA freelist_count").fetchone()[0]) * page_size
+            excess = used - self.max_history_bytes
+            first, last = db.execute("SELECT MIN(seq), MAX(seq) FROM analyses").fetchone()
+            if excess <= 0 or first is None:
+                return
+            # Assume analyses are about the same size; another pass corrects the estimate
+            cut = first + max(1, math.ceil((last - first + 1) * excess / used))
+            db.execute("""
+                DELETE FROM description_texts WHERE hash IN (
+                    SELECT description_hash FROM analyses WHERE seq < ?
+                ) AND NOT EXISTS (
+                    SELECT 1 FROM analyses WHERE description_hash = description_texts.hash AND seq >= ?
+                )
+            """, (cut, cut))
+            db.execute("DELETE FROM analyses WHERE seq < ?", (cut,))
+            db.commit()
+            logger.info('Pruned analysis history before seq %d to stay within %d bytes', cut, self.max_history_bytes)
+
+ANALYSIS_WRITER = AnalysisWriter(
+    DATABASE_PATH, ANALYSIS_WRITE_BATCH_SIZE, ANALYSIS_WRITE_INTERVAL, int(HISTORY_MAX_MB * 1024 * 1024)
+)
+atexit.register(ANALYSIS_WRITER.flush)
+
+def _bucket_stats(row: sqlite3.Row) -> dict:
+    return {
+        'bucket': row['bucket'],
+        'total_analyses': row['total'],
+        'scam_count': row['scam_count'],
+        'average_confidence': round(row['confidence_sum'] / row['total'], 2) if row['total'] else 0
+    }
+
+def read_analysis_stats() -> dict:
+    """Read the running aggregates - cost does not depend on the history size"""
+    db = get_db()
+    totals = db.execute("SELECT risk_level, total, scam_count, confidence_sum FROM analysis_totals").fetchall()
+    total_analyses = sum(row['total'] for row in totals)
+    scam_count = sum(row['scam_count'] for row in totals)
+    confidence_sum = sum(row['confidence_sum'] for row in totals)
+
+    now = datetime.now()
+    windows = {}
+    for granularity, length, delta in (
+        ('minute', 16, timedelta(minutes=STATS_MINUTE_WINDOW - 1)),
+        ('hour', 13, timedelta(hours=STATS_HOUR_WINDOW - 1))
+    ):
+        rows = db.execute(
+            "SELECT bucket, total, scam_count, confidence_sum FROM analysis_buckets "
+            "WHERE granularity = ? AND bucket >= ? ORDER BY bucket",
+            (granularity, (now - delta).isoformat()[:length])
+        ).fetchall()
+        windows[granularity] = [_bucket_stats(row) for row in rows]
+
+    return {
+        'total_analyses': total_analyses,
+        'scam_count': scam_count,
+        'legitimate_count': total_analyses - scam_count,
+        'average_confidence': round(confidence_sum / total_analyses, 2) if total_analyses else 0,
+        'scam_percentage': round((scam_count / total_analyses) * 100, 2) if total_analyses else 0,
+        'risk_levels': {row['risk_level']: row['total'] for row in totals},
+        'per_minute': windows['minute'],
+        'per_hour': windows['hour']
+    }
+
+def analysis_row_to_json(row: sqlite3.Row) -> str:
+    """One history record as JSON; the stored analysis JSON is spliced in as-is instead of parsed and re-encoded."""
+    return (
+        f'{{"analysis":{row["analysis"]},"description":{json.dumps(unpack_description(row["description"]))},'
+        f'"id":{json.dumps(row["id"])},"timestamp":{json.dumps(row["timestamp"])},"user_ip":{json.dumps(row["user_ip"])}}}'
+    )
+
+# ------------------------------------------------------------------------------
+# Fast model backend
+# ------------------------------------------------------------------------------
+
+def _check_input(X: Any, n_features: int) -> np.ndarray:
+    """Validate a feature matrix the way sklearn does, so bad input still fails instead of scoring."""
+    X = np.asarray(X, dtype=np.float64)
+    if X.ndim != 2:
+        raise ValueError(f'Expected 2D array, got {X.ndim}D array instead')
+    if X.shape[1] != n_features:
+        raise ValueError(f'X has {X.shape[1]} features, but the model is expecting {n_features} features as input')
+    return X
+
+class LinearScorer:
+    """predict_proba for a fitted LogisticRegression, computed from its coefficients."""
+
+    def __init__(self, model: Any):
+        self.model = model
+        self.classes_ = model.classes_
+        self.n_features_in_ = model.coef_.shape[1]
+        self.coef_t = np.ascontiguousarray(model.coef_.T, dtype=np.float64)
+        self.intercept = np.asarray(model.intercept_, dtype=np.float64)
+        multi_class = getattr(model, 'multi_class', 'auto')
+        self.ovr = multi_class in ('ovr', 'warn') or (
+            multi_class == 'auto' and (len(self.classes_) <= 2 or getattr(model, 'solver', None) == 'liblinear')
+        )
+
+    def decision_function(self, X: Any) -> np.ndarray:
+        scores = _check_input(X, self.n_features_in_) @ self.coef_t + self.intercept
+        return scores.ravel() if scores.shape[1] == 1 else scores
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        X = _check_input(X, self.n_features_in_)
+        if not np.isfinite(X).all():
+            # Let sklearn reject NaN/inf exactly as it would
+            return self.model.predict_proba(X)
+        scores = self.decision_function(X)
+        if scores.ndim == 1:
+            prob = 1.0 / (1.0 + np.exp(-scores))
+            return np.vstack([1 - prob, prob]).T
+        if self.ovr:
+            prob = 1.0 / (1.0 + np.exp(-scores))
+            return prob / prob.sum(axis=1).reshape((prob.shape[0], -1))
+        scores = np.exp(scores - scores.max(axis=1, keepdims=True))
+        return scores / scores.sum(axis=1, keepdims=True)
+
+    def predict(self, X: Any) -> np.ndarray:
+        scores = self.decision_function(X)
+        indices = (scores > 0).astype(int) if scores.ndim == 1 else scores.argmax(axis=1)
+        return self.classes_.take(indices)
+
+class ForestScorer:
+    """predict_proba for a decision tree or a random/extra-trees forest.
+
+    The nodes of every tree are concatenated into flat arrays, and all trees walk all rows
+    together, one level per step. Leaves point at themselves, so rows that reach a leaf early
+    just stay there.
+    """
+
+    def __init__(self, model: Any, trees: List[Any], classes: np.ndarray, n_features: int):
+        self.model = model
+        self.classes_ = classes
+        self.n_features_in_ = n_features
+        self.n_trees = len(trees)
+        self.max_depth = max(tree.max_depth for tree in trees)
+
+        counts = [tree.node_count for tree in trees]
+        offsets = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.intp)
+        features, thresholds, lefts, rights, values = [], [], [], [], []
+        for offset, count, tree in zip(offsets, counts, trees):
+            nodes = np.arange(count, dtype=np.intp)
+            is_leaf = tree.children_left[:count] == -1
+            features.append(np.where(is_leaf, 0, tree.feature[:count]))
+            thresholds.append(tree.threshold[:count])
+            lefts.append(offset + np.where(is_leaf, nodes, tree.children_left[:count]))
+            rights.append(offset + np.where(is_leaf, nodes, tree.children_right[:count]))
+            # Same normalisation as DecisionTreeClassifier.predict_proba
+            value = tree.value[:count, 0, :]
+            normalizer = value.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            values.append(value / normalizer)
+
+        self.roots = offsets[:, np.newaxis]
+        self.feature = np.concatenate(features).astype(np.intp)
+        self.threshold = np.concatenate(thresholds).astype(np.float64)
+        self.left = np.concatenate(lefts).astype(np.intp)
+        self.right = np.concatenate(rights).astype(np.intp)
+        self.value = np.concatenate(values).astype(np.float64)
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        X = _check_input(X, self.n_features_in_)
+        # Trees compare float32 inputs against their thresholds; round the same way
+        with np.errstate(over='ignore'):
+            X32 = X.astype(np.float32)
+        if not np.isfinite(X32).all():
+            # Missing values follow per-node routing learned at fit time, and values past the
+            # float32 range are rejected by sklearn; leave those rows to the model
+            return self.model.predict_proba(X)
+        # Stored feature-major so the value a node tests is at feature * n_rows + row
+        n_rows = X.shape[0]
+        columns = X32.astype(np.float64).T.ravel()
+        rows = np.arange(n_rows, dtype=np.intp)
+        node = np.repeat(self.roots, n_rows, axis=1)
+        for _ in range(self.max_depth):
+            go_left = columns.take(self.feature.take(node) * n_rows + rows) <= self.threshold.take(node)
+            node = np.where(go_left, self.left.take(node), self.right.take(node))
+
+        # Add trees up one at a time, in order, like sklearn does, so the sums round identically
+        votes = self.value.take(node, axis=0)
+        proba = np.zeros(votes.shape[1:], dtype=np.float64)
+        for tree_votes in votes:
+            proba += tree_votes
+        if self.n_trees > 1:
+            proba /= self.n_trees
+        return proba
+
+    def predict(self, X: Any) -> np.ndarray:
+        return self.classes_.take(self.predict_proba(X).argmax(axis=1))
+
+FOREST_MODEL_TYPES = ('RandomForestClassifier', 'ExtraTreesClassifier')
+TREE_MODEL_TYPES = ('DecisionTreeClassifier', 'ExtraTreeClassifier')
+
+def compile_fast_scorer(model: Any) -> Optional[Any]:
+    """Build a NumPy-only scorer for the model, or None if its type isn't supported."""
+    name = type(model).__name__
+    try:
+        if name == 'LogisticRegression':
+            return LinearScorer(model)
+        if name in FOREST_MODEL_TYPES or name in TREE_MODEL_TYPES:
+            if getattr(model, 'n_outputs_', 1) != 1:
+                return None
+            estimators = model.estimators_ if name in FOREST_MODEL_TYPES else [model]
+            trees = [estimator.tree_ for estimator in estimators]
+            return ForestScorer(model, trees, model.classes_, model.n_features_in_)
+    except AttributeError:
+        return None
+    return None
+
+def _parity_probes(scorer: Any, rows: int = 512) -> np.ndarray:
+    """Inputs for the parity check: random rows plus values on and right next to tree thresholds."""
+    rng = np.random.default_rng(0)
+    n_features = scorer.n_features_in_
+    probes = [rng.normal(0, 50, size=(rows, n_features)), rng.integers(0, 50, size=(rows, n_features))]
+    if isinstance(scorer, ForestScorer):
+        splits = scorer.left != np.arange(scorer.left.shape[0])
+        for feature in range(n_features):
+            thresholds = scorer.threshold[splits & (scorer.feature == feature)]
+            if thresholds.size == 0:
+                continue
+            candidates = np.concatenate([
+                thresholds, np.nextafter(thresholds, -np.inf), np.nextafter(thresholds, np.inf),
+                np.nextafter(thresholds.astype(np.float32), np.float32(np.inf)).astype(np.float64)
+            ])
+            column = rng.choice(candidates, size=rows)
+            probe = np.array(probes[0], copy=True)
+            probe[:, feature] = column
+            probes.append(probe)
+        picked = np.zeros((rows, n_features))
+        for feature in range(n_features):
+            thresholds = scorer.threshold[splits & (scorer.feature == feature)]
+            picked[:, feature] = rng.choice(thresholds, size=rows) if thresholds.size else rng.normal(0, 50, rows)
+        probes.append(picked)
+    return np.vstack(probes).astype(np.float64)
+
+def check_scorer_parity(model: Any, scorer: Any, tolerance: float = 1e-12) -> float:
+    """Largest absolute difference between the scorer and the estimator; raises if over tolerance."""
+    probes = _parity_probes(scorer)
+    expected = np.asarray(model.predict_proba(probes), dtype=np.float64)
+    actual = scorer.predict_proba(probes)
+    if expected.shape != actual.shape:
+        raise ValueError(f'fast scorer returned shape {actual.shape}, expected {expected.shape}')
+    diff = float(np.max(np.abs(expected - actual))) if expected.size else 0.0
+    if not diff <= tolerance:
+        raise ValueError(f'fast scorer differs from the estimator by {diff:g}')
+    if not np.array_equal(model.predict(probes), scorer.predict(probes)):
+        raise ValueError('fast scorer predicts different classes than the estimator')
+    return diff
+
+def select_model_backend(model: Any) -> Tuple[Any, str]:
+    """Pick what scores this model: a parity-checked fast scorer when possible, else the model itself."""
+    if MODEL_BACKEND != 'auto':
+        return model, 'sklearn'
+    scorer = compile_fast_scorer(model)
+    if scorer is None:
+        return model, 'sklearn'
+    try:
+        diff = check_scorer_parity(model, scorer)
+    except Exception as e:
+        logger.warning('Fast scorer disabled for %s: %s', type(model).__name__, e)
+        return model, 'sklearn'
+    logger.info('Using fast scorer for %s', type(model).__name__, extra={'fields': {'max_abs_diff': diff}})
+    return scorer, 'numpy'
+
 # ------------------------------------------------------------------------------
 # Model loading & prediction
 # ------------------------------------------------------------------------------
 
-MODEL: Optional[Any] = None
-VECTORIZER: Optional[TfidfVectorizer] = None
+class LoadedModel:
+    """One loaded model version. It is swapped in as a whole, so readers never see a mix of two."""
+
+    def __init__(self, version: str, path: str, fingerprint: str, model: Any,
+                 vectorizer: Optional[TfidfVectorizer], feature_names: Optional[List[str]]):
+        self.version = version
+        self.path = path
+        self.fingerprint = fingerprint
+        self.model = model
+        self.vectorizer = vectorizer
+        self.feature_names = feature_names
+        self.loaded_at = datetime.now().isoformat()
+        # What predictions actually call: a fast scorer compiled from the model, or the model itself
+        self.scorer, self.backend = select_model_backend(model)
+        self.n_features = expected_feature_count(model, feature_names)
+        self.scoring_strategy = resolve_scoring_strategy(self.scorer, self.n_features)
+
+ACTIVE_MODEL: Optional[LoadedModel] = None
 MODEL_ERROR: Optional[str] = None
 
-def extract_text_features(text: str) -> List[float]:
-    """Extract features from text for ML model - matches training features"""
+# Progress of the last background activation
+MODEL_ACTIVATION: dict = {'state': 'idle', 'version': None, 'error': None, 'started_at': None, 'finished_at': None}
+_ACTIVATION_LOCK = threading.Lock()
+_POINTER_CHECKED_AT = 0.0
+
+# Compiled once; the patterns are part of the feature definitions the model was trained on
+SENTENCE_END_RE = re.compile(r'[.!?]+')
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+PHONE_RE = re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b')
+ASCII_UPPERCASE = b'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+def count_uppercase(text: str) -> int:
+    """Number of characters for which str.isupper() is true."""
+    if text.isascii():
+        # A-Z are the only uppercase ASCII characters; deleting them is a single C-level pass
+        return len(text) - len(text.encode('ascii').translate(None, ASCII_UPPERCASE))
+    return sum(map(str.isupper, text))
+
+def extract_text_features(text: str, scan: Optional[Dict[str, Any]] = None) -> List[float]:
+    """Extract features from text for ML model - matches training features
+
+    scan can pass in an existing scan_text result for the same text.
+    """
     if not text:
         text = ""
-    
-    text_lower = text.lower()
-    word_count = len(text.split())
+
+    if scan is None:
+        scan = scan_text(text)
+    keyword_hits = scan['keyword_hits']
+    word_count = scan['word_count']
     char_count = len(text)
-    sentence_count = len(re.split(r'[.!?]+', text))
+    # Same as len(re.split(r'[.!?]+', text)) without building the pieces
+    sentence_count = len(SENTENCE_END_RE.findall(text)) + 1
 
     # Scam indicators - matching training features
-    urgent_words = ['urgent', 'immediate', 'asap', 'quick', 'fast', 'hurry', 'now']
-    money_words = ['salary', 'pay', 'money', 'income', 'earn', 'profit', 'cash', 'guaranteed', 'promise']
-    work_from_home = ['remote', 'work from home', 'home based', 'telecommute', 'online']
-    suspicious_words = ['investment', 'cryptocurrency', 'bitcoin', 'multi-level', 'pyramid', 'commission only']
-    
-    urgent_count = sum(1 for word in urgent_words if word in text_lower)
-    money_count = sum(1 for word in money_words if word in text_lower)
-    wfh_count = sum(1 for word in work_from_home if word in text_lower)
-    suspicious_count = sum(1 for word in suspicious_words if word in text_lower)
+    urgent_count = len(keyword_hits['feature_urgent'])
+    money_count = len(keyword_hits['feature_money'])
+    wfh_count = len(keyword_hits['feature_wfh'])
+    suspicious_count = len(keyword_hits['feature_suspicious'])
 
     # Contact information
-    has_email = 1 if re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b', text) else 0
-    has_phone = 1 if re.search(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', text) else 0
-    has_website = 1 if re.search(r'http[s]?://', text) else 0
+    has_email = 1 if '@' in text and EMAIL_RE.search(text) else 0
+    has_phone = 1 if PHONE_RE.search(text) else 0
+    has_website = 1 if 'http://' in text or 'https://' in text else 0
 
     # Text characteristics
     exclamation_count = text.count('!')
-    caps_ratio = sum(1 for c in text if c.isupper()) / max(len(text), 1)
-    
+    caps_ratio = count_uppercase(text) / max(char_count, 1)
+
     # Specific scam phrases
-    scam_phrases = [
-        'no experience needed', 'work from home', 'high salary', 'quick money',
-        'easy money', 'get rich quick', 'pay upfront', 'registration fee',
-        'processing fee', 'guaranteed income', 'unlimited earning',
-        'no interview required', 'immediate start'
-    ]
-    scam_phrase_count = sum(1 for phrase in scam_phrases if phrase in text_lower)
+    scam_phrase_count = len(keyword_hits['feature_scam_phrases'])
 
     return [
         word_count, char_count, sentence_count,
@@ -297,59 +1749,249 @@ def extract_text_features(text: str) -> List[float]:
         exclamation_count, caps_ratio, scam_phrase_count
     ]
 
-def load_model() -> None:
-    global MODEL, VECTORIZER, MODEL_ERROR
-    MODEL, VECTORIZER, MODEL_ERROR = None, None, None
+def _load_model_data(raw: bytes, fingerprint: str, path: str) -> Any:
+    if MODEL_LOAD_MODE != 'mmap':
+        return pickle.loads(raw)
+
+    import joblib
+
+    # Uncompressed joblib artifact named after the source fingerprint, written once per model
+    mmap_path = f"{os.path.splitext(path)[0]}.{fingerprint[:16]}.joblib"
+    if not os.path.exists(mmap_path):
+        tmp_path = f"{mmap_path}.{os.getpid()}.tmp"
+        joblib.dump(pickle.loads(raw), tmp_path)
+        os.replace(tmp_path, mmap_path)
+    return joblib.load(mmap_path, mmap_mode='r')
+
+def list_model_versions() -> List[dict]:
+    versions = []
+    for name in sorted(os.listdir(MODELS_DIR)):
+        version, ext = os.path.splitext(name)
+        if ext != '.pkl':
+            continue
+        path = os.path.join(MODELS_DIR, name)
+        versions.append({
+            'version': version,
+            'size': os.path.getsize(path),
+            'modified_at': datetime.fromtimestamp(os.path.getmtime(path)).isoformat()
+        })
+    return versions
+
+def model_version_path(version: str) -> Optional[str]:
+    if not version or not re.fullmatch(r'[A-Za-z0-9._-]+', version):
+        return None
+    path = os.path.join(MODELS_DIR, f'{version}.pkl')
+    return path if os.path.isfile(path) else None
 
-    if not os.path.exists(MODEL_PATH):
-        MODEL_ERROR = f"Model file not found at {MODEL_PATH}"
-        print(f"Model loading error: {MODEL_ERROR}")
+def _read_active_pointer() -> Optional[str]:
+    try:
+        with open(MODEL_ACTIVE_POINTER) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+def _write_active_pointer(version: str) -> None:
+    tmp_path = f"{MODEL_ACTIVE_POINTER}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(version)
+    os.replace(tmp_path, MODEL_ACTIVE_POINTER)
+
+def _load_model_version(version: str, path: str) -> LoadedModel:
+    with open(path, 'rb') as f:
+        raw = f.read()
+    fingerprint = hashlib.sha256(raw).hexdigest()
+    model_data = _load_model_data(raw, fingerprint, path)
+
+    if isinstance(model_data, dict):
+        model = model_data.get('model')
+        if model is None:
+            raise ValueError("Model not found in loaded data")
+        loaded = LoadedModel(version, path, fingerprint, model,
+                             model_data.get('vectorizer'), model_data.get('feature_names'))
+        logger.info('Model loaded successfully: %s', type(model), extra={'fields': {
+            'version': version, 'feature_names': model_data.get('feature_names', 'Unknown')
+        }})
+    else:
+        loaded = LoadedModel(version, path, fingerprint, model_data, None, None)
+        logger.info('Model loaded successfully: %s', type(model_data), extra={'fields': {'version': version}})
+    return loaded
+
+def _activate(loaded: Optional[LoadedModel]) -> None:
+    global ACTIVE_MODEL
+    previous = ACTIVE_MODEL
+    ACTIVE_MODEL = loaded
+    # Swap first, then invalidate: results computed against the old model are dropped
+    if (previous and previous.fingerprint) != (loaded and loaded.fingerprint):
+        ANALYSIS_CACHE.invalidate()
+
+def load_model() -> None:
+    """Synchronously (re)load the active registry version, or the default model"""
+    global MODEL_ERROR
+    MODEL_ERROR = None
+
+    version = _read_active_pointer() or DEFAULT_MODEL_VERSION
+    path = model_version_path(version) or (MODEL_PATH if version == DEFAULT_MODEL_VERSION else None)
+    if path is None or not os.path.exists(path):
+        MODEL_ERROR = f"Model file not found at {path or version}"
+        logger.error('Model loading error: %s', MODEL_ERROR)
+        _activate(None)
         return
 
     try:
-        with open(MODEL_PATH, 'rb') as f:
-            model_data = pickle.load(f)
-
-        if isinstance(model_data, dict):
-            MODEL = model_data.get('model')
-            VECTORIZER = model_data.get('vectorizer')
-            if MODEL is not None:
-                print(f"Model loaded successfully: {type(MODEL)}")
-                print(f"Feature names: {model_data.get('feature_names', 'Unknown')}")
-            else:
-                MODEL_ERROR = "Model not found in loaded data"
-                print(f"Model loading error: {MODEL_ERROR}")
-        else:
-            MODEL = model_data
-            VECTORIZER = None
-            print(f"Model loaded successfully: {type(MODEL)}")
-            
+        _activate(_load_model_version(version, path))
     except Exception as e:
-        MODEL = None
-        VECTORIZER = None
         MODEL_ERROR = f"Failed to load model: {e}"
-        print(f"Model loading error: {MODEL_ERROR}")
-
-def compute_confidence_from_model(model: Any, features: List[float]) -> float:
+        logger.error('Model loading error: %s', MODEL_ERROR)
+        _activate(None)
+
+def activate_model_version(version: str, persist: bool = True) -> bool:
+    """Load a registry version in the background and swap it in once it is ready.
+
+    Returns False when another activation is still running. In-flight requests keep
+    the model they started with; a failed load leaves the current model active.
+    """
+    global MODEL_ACTIVATION
+    path = model_version_path(version)
+    if path is None:
+        raise ValueError(f"Unknown model version: {version}")
+    if not _ACTIVATION_LOCK.acquire(blocking=False):
+        return False
+
+    MODEL_ACTIVATION = {
+        'state': 'loading', 'version': version, 'error': None,
+        'started_at': datetime.now().isoformat(), 'finished_at': None
+    }
+    threading.Thread(
+        target=_activate_in_background, args=(version, path, persist),
+        name='model-activation', daemon=True
+    ).start()
+    return True
+
+def _activate_in_background(version: str, path: str, persist: bool) -> None:
+    global MODEL_ACTIVATION, MODEL_ERROR
     try:
-        proba = model.predict_proba([features])
-        return float(max(proba[0]))
-    except Exception:
-        pass
+        loaded = _load_model_version(version, path)
+        if persist:
+            _write_active_pointer(version)
+        _activate(loaded)
+        MODEL_ERROR = None
+        MODEL_ACTIVATION = dict(MODEL_ACTIVATION, state='active', finished_at=datetime.now().isoformat())
+    except Exception as e:
+        logger.exception('Model activation failed for %s', version)
+        MODEL_ACTIVATION = dict(MODEL_ACTIVATION, state='failed', error=str(e),
+                                finished_at=datetime.now().isoformat())
+    finally:
+        _ACTIVATION_LOCK.release()
+
+def _follow_active_pointer() -> None:
+    # Another worker may have activated a different version; pick it up within the poll interval
+    global _POINTER_CHECKED_AT
+    now = time.monotonic()
+    if now - _POINTER_CHECKED_AT < MODEL_REGISTRY_POLL_SECONDS:
+        return
+    _POINTER_CHECKED_AT = now
 
+    version = _read_active_pointer()
+    active = ACTIVE_MODEL
+    if version is None or (active is not None and active.version == version):
+        return
+    if MODEL_ACTIVATION['version'] == version and MODEL_ACTIVATION['state'] in ('loading', 'failed'):
+        return
+    if model_version_path(version) is not None:
+        activate_model_version(version, persist=False)
+
+def get_active_model() -> Optional[LoadedModel]:
+    _ensure_model_warmup()
+    _follow_active_pointer()
+    return ACTIVE_MODEL
+
+def _prediction_to_confidence(pred: Any) -> float:
     try:
-        score = model.decision_function([features])
-        s = float(score[0] if hasattr(score, "__len__") else score)
-        return 1.0 / (1.0 + math.exp(-s))
+        return float(pred)
     except Exception:
-        pass
+        return 1.0 if str(pred).lower() in ("1", "true", "yes", "positive") else 0.0
+
+def _proba_confidences(model: Any, rows: List[List[float]]) -> List[float]:
+    if len(rows) == 1:
+        return [float(max(MICRO_BATCHER.predict_proba(model, rows[0])))]
+    return [float(p) for p in np.max(model.predict_proba(rows), axis=1)]
+
+def _decision_confidences(model: Any, rows: List[List[float]]) -> List[float]:
+    scores = np.asarray(model.decision_function(rows), dtype=float).reshape(len(rows))
+    return [1.0 / (1.0 + math.exp(min(-float(s), 700.0))) for s in scores]
+
+def _predict_confidences(model: Any, rows: List[List[float]]) -> List[float]:
+    return [_prediction_to_confidence(pred) for pred in model.predict(rows)]
+
+# Tried in this order; the first one that scores a probe input is used for the model's lifetime
+SCORING_STRATEGIES = OrderedDict([
+    ('predict_proba', _proba_confidences),
+    ('decision_function', _decision_confidences),
+    ('predict', _predict_confidences),
+])
+
+def expected_feature_count(model: Any, feature_names: Optional[List[str]]) -> Optional[int]:
+    n_features = getattr(model, 'n_features_in_', None)
+    if n_features is None and feature_names:
+        n_features = len(feature_names)
+    return int(n_features) if n_features is not None else None
+
+def resolve_scoring_strategy(model: Any, n_features: Optional[int]) -> Optional[str]:
+    """Pick how /api/predict scores this model, once at load time instead of by trial on every call."""
+    for name, score in SCORING_STRATEGIES.items():
+        if not hasattr(model, name):
+            continue
+        if n_features is None:
+            # Nothing to probe with; trust the first method the model has
+            return name
+        try:
+            # Two rows so the probe calls the model directly rather than the micro-batcher
+            confidences = score(model, [[0.0] * n_features, [0.0] * n_features])
+        except Exception as e:
+            logger.warning('Model %s scoring is unusable: %s', name, e)
+            continue
+        if len(confidences) == 2 and all(math.isfinite(c) for c in confidences):
+            return name
+    return None
+
+def compute_confidences(active: LoadedModel, rows: List[List[float]]) -> List[float]:
+    """Confidence for each row, scored with the strategy resolved when the model loaded."""
+    if active.scoring_strategy is None:
+        return [0.0] * len(rows)
+    score = SCORING_STRATEGIES[active.scoring_strategy]
+    confidences = []
+    for start in range(0, len(rows), ANALYZE_BATCH_CHUNK_SIZE):
+        confidences.extend(score(active.scorer, rows[start:start + ANALYZE_BATCH_CHUNK_SIZE]))
+    return confidences
+
+def compute_confidence(active: LoadedModel, features: List[float]) -> float:
+    return compute_confidences(active, [features])[0]
+
+# Scoring strategy of each estimator passed to compute_confidence_from_model; weak keys let swapped-out models go
+_MODEL_STRATEGIES: 'weakref.WeakKeyDictionary[Any, Optional[str]]' = weakref.WeakKeyDictionary()
+
+def _model_scoring_strategy(model: Any, row_width: int) -> Optional[str]:
+    try:
+        return _MODEL_STRATEGIES[model]
+    except KeyError:
+        cacheable = True
+    except TypeError:
+        # Can't be weakly referenced: resolve on every call
+        cacheable = False
+    n_features = expected_feature_count(model, None)
+    strategy = resolve_scoring_strategy(model, n_features if n_features is not None else row_width)
+    # Probing with the caller's row only proves something when it works; a wrong-width row must not stick
+    if cacheable and (strategy is not None or n_features is not None):
+        _MODEL_STRATEGIES[model] = strategy
+    return strategy
 
+def compute_confidence_from_model(model: Any, features: List[float]) -> float:
+    """Confidence for one feature row from a bare estimator, with its scoring strategy resolved once per model."""
+    strategy = _model_scoring_strategy(model, len(features))
+    if strategy is None:
+        return 0.0
     try:
-        pred = model.predict([features])[0]
-        try:
-            return float(pred)
-        except Exception:
-            return 1.0 if str(pred).lower() in ("1", "true", "yes", "positive") else 0.0
+        return SCORING_STRATEGIES[strategy](model, [features])[0]
     except Exception:
         return 0.0
 
@@ -357,12 +1999,58 @@ def compute_confidence_from_model(model: Any, features: List[float]) -> float:
 # Startup init
 # ------------------------------------------------------------------------------
 
+_STARTUP_DONE = False
+_STARTUP_LOCK = threading.Lock()
+_WARMUP_DONE = threading.Event()
+_WARMUP_PID = None
+
+def _warm_up_model() -> None:
+    try:
+        # Holding the activation lock keeps registry activations from racing the first load
+        with _ACTIVATION_LOCK:
+            load_model()
+    finally:
+        _WARMUP_DONE.set()
+
+def _ensure_model_warmup() -> None:
+    """Start loading the model on a background thread, once per process.
+
+    A process forked before the warm-up finished (e.g. a worker forked mid-load) starts
+    its own, since the loading thread doesn't survive the fork.
+    """
+    global _WARMUP_PID
+    if _WARMUP_DONE.is_set() or _WARMUP_PID == os.getpid():
+        return
+    with _STARTUP_LOCK:
+        if _WARMUP_DONE.is_set() or _WARMUP_PID == os.getpid():
+            return
+        _WARMUP_PID = os.getpid()
+        threading.Thread(target=_warm_up_model, name='model-warmup', daemon=True).start()
+
+def is_ready() -> bool:
+    """Whether the startup model load has finished (successfully or not)."""
+    return _WARMUP_DONE.is_set()
+
+def wait_until_ready(timeout: Optional[float] = None) -> bool:
+    """Block until the startup model load has finished; for CLI tools and the gunicorn master."""
+    _ensure_model_warmup()
+    return _WARMUP_DONE.wait(timeout)
+
 def _startup_init_once():
-    os.makedirs(MODELS_DIR, exist_ok=True)
-    os.makedirs(DATABASE_DIR, exist_ok=True)
-    with app.app_context():
-        initialize_database()
-    load_model()
+    global _STARTUP_DONE, _WARMUP_PID
+    with _STARTUP_LOCK:
+        if _STARTUP_DONE:
+            return
+        os.makedirs(MODELS_DIR, exist_ok=True)
+        os.makedirs(DATABASE_DIR, exist_ok=True)
+        with app.app_context():
+            initialize_database()
+        _STARTUP_DONE = True
+        if MODEL_WARMUP == 'sync':
+            _WARMUP_PID = os.getpid()
+            _warm_up_model()
+            return
+    _ensure_model_warmup()
 
 _startup_init_once()
 
@@ -391,6 +2079,8 @@ def register():
         session['user_id'] = user_id
         session['email'] = email
         return jsonify({'success': True, 'message': 'Registration successful', 'userId': user_id})
+    except PasswordHashOverloaded:
+        raise
     except sqlite3.IntegrityError:
         return jsonify({'success': False, 'error': 'Email already exists'}), 409
     except Exception as e:
@@ -408,7 +2098,7 @@ def login():
         return jsonify({'success': False, 'error': 'Please enter a valid email address'}), 400
 
     row = find_user_by_email(email)
-    if row is None or not check_password_hash(row['password_hash'], password):
+    if row is None or not verify_password(row['password_hash'], password):
         return jsonify({'success': False, 'error': 'Invalid email or password'}), 401
 
     session['user_id'] = int(row['id'])
@@ -426,21 +2116,263 @@ def auth_me():
         return jsonify({'authenticated': False})
     return jsonify({'authenticated': True, 'userId': session['user_id'], 'email': session['email']})
 
+# ------------------------------------------------------------------------------
+# Inference executor & micro-batching
+# ------------------------------------------------------------------------------
+
+class Overloaded(Exception):
+    """Work was shed: a bounded executor's queue is full or the call timed out"""
+
+class InferenceOverloaded(Overloaded):
+    """Analysis or prediction was shed"""
+
+class PasswordHashOverloaded(Overloaded):
+    """Password hashing was shed"""
+
+class ModelStarting(Overloaded):
+    """The model is still loading after startup"""
+
+def _require_model_ready() -> None:
+    """Turn analysis requests away during the warm-up instead of recording rule-based results."""
+    _ensure_model_warmup()
+    if not is_ready():
+        raise ModelStarting('Model is still loading, please retry shortly')
+
+class BoundedExecutor:
+    """Runs CPU-bound work (analysis, prediction, password hashing) on a bounded thread pool.
+
+    At most workers + queue_size calls are admitted at once; further calls are
+    rejected immediately instead of piling up, and callers stop waiting after
+    timeout seconds. Cheap routes never enter a pool, so they are not queued
+    behind slow work. The pool is created lazily in each (forked) process.
+    """
+
+    def __init__(self, name: str, workers: int, queue_size: int, timeout: float,
+                 rejected: Counter, overloaded: type, timeout_message: str):
+        self.name = name
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.timeout = timeout
+        self.rejected = rejected
+        self.overloaded = overloaded
+        self.timeout_message = timeout_message
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pid = None
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None or self._pid != os.getpid():
+            with self._lock:
+                if self._pool is None or self._pid != os.getpid():
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.name)
+                    self._pid = os.getpid()
+                    self.in_flight = 0
+        return self._pool
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def run(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)
+
+        pool = self._get_pool()
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                self.rejected.inc('queue_full')
+                raise self.overloaded('Server is busy, please retry shortly')
+            self.in_flight += 1
+        try:
+            future = pool.submit(fn, *args)
+        except Exception:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            self.rejected.inc('timeout')
+            raise self.overloaded(self.timeout_message)
+
+INFERENCE_EXECUTOR = BoundedExecutor('inference', INFERENCE_WORKERS, INFERENCE_QUEUE_SIZE, INFERENCE_TIMEOUT,
+                                     INFERENCE_REJECTED, InferenceOverloaded,
+                                     'Analysis timed out, please retry shortly')
+PASSWORD_HASH_EXECUTOR = BoundedExecutor('password-hash', PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_SIZE,
+                                         PASSWORD_HASH_TIMEOUT, PASSWORD_HASH_REJECTED, PasswordHashOverloaded,
+                                         'Sign-in timed out, please retry shortly')
+if sum(e.capacity for e in (INFERENCE_EXECUTOR, PASSWORD_HASH_EXECUTOR) if e.workers > 0) >= REQUEST_THREADS:
+    logger.warning('Inference and password-hash pools admit as many calls as there are request threads (%d); '
+                   'cheap routes can queue behind them', REQUEST_THREADS)
+
+def _timed_password_hash(operation: str, fn, *args):
+    started = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        PASSWORD_HASH_SECONDS.observe(time.perf_counter() - started, operation)
+
+def hash_password(password: str) -> str:
+    return PASSWORD_HASH_EXECUTOR.run(_timed_password_hash, 'hash', generate_password_hash, password)
+
+def verify_password(password_hash: str, password: str) -> bool:
+    return PASSWORD_HASH_EXECUTOR.run(_timed_password_hash, 'check', check_password_hash, password_hash, password)
+
+class MicroBatcher:
+    """Coalesces concurrent single-row predict_proba calls into one vectorized call.
+
+    A caller with no other call in flight scores its row inline and never waits. Otherwise
+    callers enqueue their feature row and wait; a scorer thread collects rows for up to
+    max_wait seconds or max_size rows, but stops early once every concurrent caller is in
+    the batch. It scores them with one predict_proba per model and row length and hands each
+    caller its own probability row. If a batch fails, its rows are rescored one by one so a
+    bad row only fails its own request.
+    """
+
+    def __init__(self, max_size: int, max_wait: float):
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._count_lock = threading.Lock()
+        self._in_flight = 0
+        self._inline = 0
+
+    def predict_proba(self, model: Any, row: List[float]) -> np.ndarray:
+        if self.max_size <= 1:
+            return model.predict_proba([row])[0]
+        with self._count_lock:
+            self._in_flight += 1
+            inline = self._in_flight == 1
+            self._inline += inline
+        try:
+            if inline:
+                return model.predict_proba([row])[0]
+            self._ensure_started()
+            future = Future()
+            self._queue.put((model, row, future))
+            return future.result()
+        finally:
+            with self._count_lock:
+                self._in_flight -= 1
+                self._inline -= inline
+
+    def reset_counts(self) -> None:
+        """Forget callers of the parent process; called in a forked child."""
+        self._count_lock = threading.Lock()
+        self._in_flight = 0
+        self._inline = 0
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._queue = queue.SimpleQueue()
+            self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_size:
+                remaining = deadline - time.monotonic()
+                # Stop waiting once no concurrent caller is left outside the batch
+                if len(batch) >= self._in_flight - self._inline:
+                    remaining = 0
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            MICRO_BATCH_SIZE.observe(len(batch))
+            self._score(batch)
+
+    @staticmethod
+    def _score(batch: list) -> None:
+        groups = {}
+        for item in batch:
+            groups.setdefault((id(item[0]), len(item[1])), []).append(item)
+
+        for items in groups.values():
+            model = items[0][0]
+            try:
+                proba = model.predict_proba(np.asarray([row for _, row, _ in items], dtype=float))
+                for (_, _, future), row_proba in zip(items, proba):
+                    future.set_result(row_proba)
+            except Exception:
+                for _, row, future in items:
+                    try:
+                        future.set_result(model.predict_proba([row])[0])
+                    except Exception as e:
+                        future.set_exception(e)
+
+MICRO_BATCHER = MicroBatcher(MICRO_BATCH_MAX_SIZE, MICRO_BATCH_MAX_WAIT_MS / 1000.0)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=MICRO_BATCHER.reset_counts)
+
 # ------------------------------------------------------------------------------
 # Model endpoints
 # ------------------------------------------------------------------------------
 
+def _is_admin_request() -> bool:
+    auth = request.headers.get('Authorization', '')
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(auth, f'Bearer {ADMIN_TOKEN}')
+
 @app.route('/api/model/status', methods=['GET'])
 def model_status():
+    active = get_active_model()
+    return jsonify({
+        'loaded': active is not None,
+        'path': active.path if active is not None else MODEL_PATH,
+        'error': MODEL_ERROR,
+        'version': active.version if active is not None else None,
+        'loaded_at': active.loaded_at if active is not None else None,
+        'backend': active.backend if active is not None else None,
+        'scoring_strategy': active.scoring_strategy if active is not None else None,
+        'n_features': active.n_features if active is not None else None,
+        'activation': MODEL_ACTIVATION
+    })
+
+@app.route('/api/model/versions', methods=['GET'])
+def model_versions():
+    active = get_active_model()
     return jsonify({
-        'loaded': MODEL is not None,
-        'path': MODEL_PATH,
-        'error': MODEL_ERROR
+        'versions': list_model_versions(),
+        'active': active.version if active is not None else None
     })
 
+@app.route('/api/model/activate', methods=['POST'])
+def model_activate():
+    if not ADMIN_TOKEN:
+        return jsonify({'success': False, 'error': 'Admin endpoints are disabled'}), 403
+    if not _is_admin_request():
+        return jsonify({'success': False, 'error': 'Admin token required'}), 401
+
+    data = request.get_json(silent=True) or {}
+    version = (data.get('version') or '').strip()
+    if model_version_path(version) is None:
+        return jsonify({'success': False, 'error': f'Unknown model version: {version}'}), 404
+    if not activate_model_version(version):
+        return jsonify({'success': False, 'error': 'Another model activation is in progress'}), 409
+
+    return jsonify({'success': True, 'message': f'Activating model version {version}', 'activation': MODEL_ACTIVATION}), 202
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify(ANALYSIS_CACHE.stats())
+
 @app.route('/api/predict', methods=['POST'])
 def predict():
-    if MODEL is None:
+    active = get_active_model()
+    if active is None:
         return jsonify({'success': False, 'error': MODEL_ERROR or 'Model not loaded'}), 503
 
     data = request.get_json(silent=True) or {}
@@ -449,40 +2381,64 @@ def predict():
     if not isinstance(features, list) or len(features) == 0:
         return jsonify({'success': False, 'error': 'features must be a non-empty array'}), 400
 
+    # A flat array is one row; an array of arrays scores every row in one call
+    multi_row = isinstance(features[0], list)
+    rows = features if multi_row else [features]
+    if multi_row and not all(isinstance(row, list) and row for row in rows):
+        return jsonify({'success': False, 'error': 'features rows must be non-empty arrays'}), 400
+    if len(rows) > PREDICT_MAX_ROWS:
+        return jsonify({'success': False, 'error': f'At most {PREDICT_MAX_ROWS} feature rows per request'}), 400
+
     try:
-        features_cast = [float(x) for x in features]
+        rows_cast = [[float(x) for x in row] for row in rows]
     except Exception:
         return jsonify({'success': False, 'error': 'features must contain only numbers'}), 400
+    if not all(math.isfinite(x) for row in rows_cast for x in row):
+        return jsonify({'success': False, 'error': 'features must be finite numbers'}), 400
+    if active.n_features is not None and any(len(row) != active.n_features for row in rows_cast):
+        return jsonify({'success': False, 'error': f'Each feature row must have {active.n_features} values'}), 400
 
     try:
-        confidence = compute_confidence_from_model(MODEL, features_cast)
-        return jsonify({'success': True, 'confidence': round(float(confidence), 4)})
+        confidences = INFERENCE_EXECUTOR.run(compute_confidences, active, rows_cast)
+    except InferenceOverloaded:
+        raise
     except Exception as e:
         return jsonify({'success': False, 'error': f'Prediction failed: {e}'}), 500
 
+    if multi_row:
+        return jsonify({'success': True, 'confidences': [round(float(c), 4) for c in confidences]})
+    return jsonify({'success': True, 'confidence': round(float(confidences[0]), 4)})
+
 # ------------------------------------------------------------------------------
 # Job analysis
 # ------------------------------------------------------------------------------
 
+def record_analysis(description: str, analysis_result: dict) -> str:
+    analysis_id = str(uuid.uuid4())
+    ANALYSIS_WRITER.submit((
+        analysis_id,
+        description,
+        json.dumps(analysis_result, separators=(',', ':')),
+        1 if analysis_result['is_scam'] else 0,
+        float(analysis_result['confidence']),
+        analysis_result['risk_level'],
+        datetime.now().isoformat(),
+        request.remote_addr
+    ))
+    return analysis_id
+
 @app.route('/api/analyze', methods=['POST'])
 def analyze_job():
     data = request.get_json(silent=True) or {}
     description = (data.get('description') or '').strip()
     if not description:
         return jsonify({'error': 'Job description is required'}), 400
+    _require_model_ready()
 
-    analysis_result = analyze_job_description(description)
-    analysis_id = str(uuid.uuid4())
-    job_record = {
-        'id': analysis_id,
-        'description': description,
-        'analysis': analysis_result,
-        'timestamp': datetime.now().isoformat(),
-        'user_ip': request.remote_addr
-    }
-    job_database.append(job_record)
-    if len(job_database) > 1000:
-        job_database.pop(0)
+    analysis_result = INFERENCE_EXECUTOR.run(analyze_with_near_duplicates, description)
+    started = time.perf_counter()
+    analysis_id = record_analysis(description, analysis_result)
+    ANALYSIS_STAGE_SECONDS.observe(time.perf_counter() - started, 'bookkeeping', 'single')
 
     return jsonify({
         'id': analysis_id,
@@ -490,37 +2446,289 @@ def analyze_job():
         'message': 'Analysis completed successfully'
     })
 
-@app.route('/api/history', methods=['GET'])
-def get_history():
-    recent_analyses = job_database[-50:] if len(job_database) > 50 else job_database
+@app.route('/api/analyze/batch', methods=['POST'])
+def analyze_job_batch():
+    data = request.get_json(silent=True) or {}
+    descriptions = data.get('descriptions')
+
+    if not isinstance(descriptions, list) or len(descriptions) == 0:
+        return jsonify({'error': 'descriptions must be a non-empty array'}), 400
+    if len(descriptions) > ANALYZE_BATCH_MAX_ITEMS:
+        return jsonify({'error': f'At most {ANALYZE_BATCH_MAX_ITEMS} descriptions per batch'}), 413
+    if not all(isinstance(d, str) for d in descriptions):
+        return jsonify({'error': 'descriptions must contain only strings'}), 400
+    _require_model_ready()
+
+    descriptions = [d.strip() for d in descriptions]
+    analysis_results = INFERENCE_EXECUTOR.run(analyze_job_descriptions, descriptions)
+
+    started = time.perf_counter()
+    results = []
+    for description, analysis_result in zip(descriptions, analysis_results):
+        analysis_id = record_analysis(description, analysis_result)
+        results.append({'id': analysis_id, 'result': analysis_result})
+    ANALYSIS_STAGE_SECONDS.observe(time.perf_counter() - started, 'bookkeeping', 'batch')
+
     return jsonify({
-        'analyses': recent_analyses,
-        'total_count': len(job_database)
+        'results': results,
+        'count': len(results),
+        'message': 'Batch analysis completed successfully'
     })
 
+@app.route('/api/analyze/stream', methods=['POST'])
+def analyze_job_stream():
+    _require_model_ready()
+    content_type = (request.mimetype or '').lower()
+    fmt = 'csv' if content_type == 'text/csv' or request.args.get('format') == 'csv' else 'ndjson'
+    lines = (line.decode('utf-8', 'replace') for line in request.stream)
+
+    def score_chunk(chunk: List[dict]) -> List[dict]:
+        try:
+            return INFERENCE_EXECUTOR.run(score_posting_chunk, chunk)
+        except InferenceOverloaded as e:
+            return [p if 'error' in p else {'id': p['id'], 'error': str(e)} for p in chunk]
+
+    def generate():
+        for item in score_postings(iter_postings(lines, fmt), score_chunk=score_chunk):
+            yield json.dumps(item) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/api/history', methods=['GET'])
+def get_history():
+    try:
+        limit = int(request.args.get('limit', HISTORY_PAGE_SIZE))
+        cursor = request.args.get('cursor')
+        cursor = int(cursor) if cursor else None
+    except ValueError:
+        return jsonify({'error': 'limit and cursor must be integers'}), 400
+    limit = max(1, min(limit, HISTORY_MAX_PAGE_SIZE))
+
+    # Keyset pagination: pages walk backwards from the newest row by seq
+    clauses, params = [], []
+    if cursor is not None:
+        clauses.append("seq < ?")
+        params.append(cursor)
+    is_scam = request.args.get('is_scam')
+    if is_scam is not None:
+        is_scam = 1 if is_scam.lower() in ('1', 'true', 'yes') else 0
+        clauses.append("is_scam = ?")
+        params.append(is_scam)
+    risk_level = request.args.get('risk_level')
+    if risk_level:
+        clauses.append("risk_level = ?")
+        params.append(risk_level)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    db = get_db()
+    rows = db.execute(
+        "SELECT seq, id, COALESCE(description_texts.body, description) AS description, analysis, timestamp, user_ip "
+        f"FROM analyses LEFT JOIN description_texts ON description_texts.hash = analyses.description_hash {where} "
+        "ORDER BY seq DESC LIMIT ?",
+        (*params, limit + 1)
+    ).fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    # The per-risk-level aggregates hold both filters' counts, so this stays O(1) however long the history
+    counted = {None: 'total', 1: 'scam_count', 0: 'total - scam_count'}[is_scam]
+    total_count = db.execute(
+        f"SELECT COALESCE(SUM({counted}), 0) FROM analysis_totals" + (" WHERE risk_level = ?" if risk_level else ""),
+        (risk_level,) if risk_level else ()
+    ).fetchone()[0]
+
+    # Only the returned page is decoded, and each record is written straight into the response
+    body = '{"analyses":[%s],"next_cursor":%s,"total_count":%d}' % (
+        ','.join(analysis_row_to_json(row) for row in reversed(rows)),
+        json.dumps(rows[-1]['seq'] if has_more else None),
+        total_count
+    )
+    return app.response_class(body + '\n', mimetype='application/json')
+
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
-    if not job_database:
-        return jsonify({
-            'total_analyses': 0,
-            'scam_count': 0,
-            'legitimate_count': 0,
-            'average_confidence': 0,
-            'scam_percentage': 0
-        })
+    return jsonify(read_analysis_stats())
 
-    total_analyses = len(job_database)
-    scam_count = sum(1 for job in job_database if job['analysis']['is_scam'])
-    legitimate_count = total_analyses - scam_count
-    avg_confidence = sum(job['analysis']['confidence'] for job in job_database) / total_analyses
+# ------------------------------------------------------------------------------
+# Request metrics
+# ------------------------------------------------------------------------------
 
-    return jsonify({
-        'total_analyses': total_analyses,
-        'scam_count': scam_count,
-        'legitimate_count': legitimate_count,
-        'average_confidence': round(avg_confidence, 2),
-        'scam_percentage': round((scam_count / total_analyses) * 100, 2) if total_analyses else 0
-    })
+@app.before_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def _observe_request(response):
+    started = g.get('request_started')
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, route, request.method, str(response.status_code))
+    return response
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+
+    cache = ANALYSIS_CACHE.stats()
+    for name, documentation in (('hits', 'Analysis cache hits.'), ('misses', 'Analysis cache misses.'),
+                                ('evictions', 'Analysis cache evictions.')):
+        lines += [f'# HELP legitmate_analysis_cache_{name}_total {documentation}',
+                  f'# TYPE legitmate_analysis_cache_{name}_total counter',
+                  f'legitmate_analysis_cache_{name}_total {cache[name]}']
+    lines += ['# HELP legitmate_inference_in_flight Inference calls running or queued in this process.',
+              '# TYPE legitmate_inference_in_flight gauge',
+              f'legitmate_inference_in_flight {INFERENCE_EXECUTOR.in_flight}']
+    lines += ['# HELP legitmate_password_hash_in_flight Password hashing calls running or queued in this process.',
+              '# TYPE legitmate_password_hash_in_flight gauge',
+              f'legitmate_password_hash_in_flight {PASSWORD_HASH_EXECUTOR.in_flight}']
+    lines += ['# HELP legitmate_near_duplicate_index_size Postings held in the near-duplicate index.',
+              '# TYPE legitmate_near_duplicate_index_size gauge',
+              f'legitmate_near_duplicate_index_size {NEAR_DUPLICATES.size}']
+    lines += ['# HELP legitmate_model_loaded Whether a model is loaded.',
+              '# TYPE legitmate_model_loaded gauge',
+              f'legitmate_model_loaded {1 if ACTIVE_MODEL is not None else 0}']
+
+    return app.response_class('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
+
+# ------------------------------------------------------------------------------
+# Rate limiting
+# ------------------------------------------------------------------------------
+
+def parse_rate_limit(spec: str) -> Optional[Tuple[float, float]]:
+    """'<requests>/<seconds>' -> (bucket capacity, tokens refilled per second); None when disabled"""
+    requests_part, _, seconds_part = spec.partition('/')
+    capacity = float(requests_part or 0)
+    seconds = float(seconds_part or 1)
+    if capacity <= 0 or seconds <= 0:
+        return None
+    return capacity, capacity / seconds
+
+def _take_token(tokens: float, updated: float, now: float, capacity: float, rate: float) -> Tuple[float, float]:
+    """Refill a bucket up to now and take one token; returns (tokens left, seconds to wait)."""
+    tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+    if tokens >= 1.0:
+        return tokens - 1.0, 0.0
+    return tokens, (1.0 - tokens) / rate
+
+class MemoryBucketStore:
+    """Token buckets for this process, spread over shards so concurrent requests rarely share a lock.
+
+    Each shard keeps at most max_keys buckets and drops the least recently used one beyond
+    that; a dropped bucket comes back full, as it would after enough idle time.
+    """
+
+    def __init__(self, shards: int = 64, max_keys: int = 4096):
+        self._shards = [(threading.Lock(), OrderedDict()) for _ in range(shards)]
+        self.max_keys = max_keys
+
+    def take(self, key: str, capacity: float, rate: float) -> float:
+        lock, buckets = self._shards[hash(key) % len(self._shards)]
+        now = time.monotonic()
+        with lock:
+            tokens, updated = buckets.get(key, (capacity, now))
+            tokens, wait = _take_token(tokens, updated, now, capacity, rate)
+            buckets[key] = (tokens, now)
+            buckets.move_to_end(key)
+            if len(buckets) > self.max_keys:
+                buckets.popitem(last=False)
+        return wait
+
+class SqliteBucketStore:
+    """Token buckets in a small SQLite file, shared by every worker process on the machine.
+
+    A local stand-in for a shared store such as Redis: each take is one short write
+    transaction. Buckets idle for longer than idle_ttl are full again and get pruned.
+    """
+
+    PRUNE_EVERY = 1000
+
+    def __init__(self, path: str, idle_ttl: float):
+        self.path = path
+        self.idle_ttl = idle_ttl
+        self._local = threading.local()
+        self._takes = 0
+
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, 'db', None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            # Losing the last few bucket updates in a crash is harmless
+            db.execute("PRAGMA synchronous=OFF")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS buckets (
+                    key TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated REAL NOT NULL
+                )
+            """)
+            self._local.db = db
+            self._local.pid = os.getpid()
+        return db
+
+    def take(self, key: str, capacity: float, rate: float) -> float:
+        db = self._db()
+        now = time.time()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            row = db.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens, updated = row if row is not None else (capacity, now)
+            tokens, wait = _take_token(tokens, updated, now, capacity, rate)
+            db.execute("INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)", (key, tokens, now))
+            self._takes += 1
+            if self._takes % self.PRUNE_EVERY == 0:
+                db.execute("DELETE FROM buckets WHERE updated < ?", (now - self.idle_ttl,))
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        return wait
+
+# Budgets per endpoint (the view function name)
+RATE_LIMITS = {
+    endpoint: limit for endpoint, limit in (
+        ('analyze_job', parse_rate_limit(RATE_LIMIT_ANALYZE)),
+        ('analyze_job_batch', parse_rate_limit(RATE_LIMIT_ANALYZE_BATCH)),
+        ('analyze_job_stream', parse_rate_limit(RATE_LIMIT_ANALYZE_STREAM)),
+        ('predict', parse_rate_limit(RATE_LIMIT_PREDICT)),
+    ) if limit is not None
+}
+
+# Store kinds for RATE_LIMIT_STORE; register another factory here to plug in a different store
+BUCKET_STORES = {
+    'memory': lambda: MemoryBucketStore(),
+    'sqlite': lambda: SqliteBucketStore(
+        RATE_LIMIT_DB_PATH, max((capacity / rate for capacity, rate in RATE_LIMITS.values()), default=60.0)
+    ),
+}
+RATE_LIMIT_BUCKETS = BUCKET_STORES[RATE_LIMIT_STORE]()
+
+def _rate_limit_client() -> str:
+    user_id = session.get('user_id')
+    return f'user:{user_id}' if user_id is not None else f'ip:{request.remote_addr}'
+
+@app.before_request
+def _enforce_rate_limit():
+    # CORS preflights are not work, and must not spend the budget of the request they precede
+    if request.method == 'OPTIONS':
+        return None
+    limit = RATE_LIMITS.get(request.endpoint)
+    if limit is None:
+        return None
+    try:
+        wait = RATE_LIMIT_BUCKETS.take(f'{request.endpoint}:{_rate_limit_client()}', *limit)
+    except Exception:
+        # Fail open: a broken limiter store must not take the API down with it
+        logger.exception('Rate limit check failed')
+        return None
+    if wait <= 0:
+        return None
+
+    RATE_LIMITED.inc(request.endpoint)
+    response = jsonify({'success': False, 'error': 'Too many requests, please retry later'})
+    response.headers['Retry-After'] = str(max(1, math.ceil(wait)))
+    return response, 429
 
 # ------------------------------------------------------------------------------
 # Static files + health
@@ -536,11 +2744,15 @@ def serve_static(filename):
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
+    # 503 until the startup model load has finished, so load balancers hold traffic back
+    ready = is_ready()
     return jsonify({
-        'status': 'healthy',
+        'status': 'healthy' if ready else 'starting',
+        'ready': ready,
+        'model_loaded': ACTIVE_MODEL is not None,
         'timestamp': datetime.now().isoformat(),
         'version': '1.0.0'
-    })
+    }), 200 if ready else 503
 
 # ------------------------------------------------------------------------------
 # Error handling
@@ -556,6 +2768,12 @@ def not_found(err):
         return jsonify({'success': False, 'error': 'Not found'}), 404
     return err, 404
 
+@app.errorhandler(Overloaded)
+def service_overloaded(err):
+    response = jsonify({'success': False, 'error': str(err)})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
 @app.errorhandler(500)
 def server_error(err):
     return jsonify({'success': False, 'error': 'Server error', 'detail': str(err)}), 500
@@ -565,8 +2783,7 @@ def server_error(err):
 # ------------------------------------------------------------------------------
 
 if __name__ == '__main__':
-    _startup_init_once()
     port = int(os.environ.get('PORT', '5000'))
     debug = os.environ.get('FLASK_DEBUG', 'true').lower() == 'true'
-    print(f"Starting Flask server on http://127.0.0.1:{port}")
+    logger.info('Starting Flask server on http://127.0.0.1:%d', port)
     app.run(debug=debug, host='0.0.0.0', port=port, threaded=True)
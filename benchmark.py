@@ -0,0 +1,224 @@
+"""Benchmarks for the job analysis pipeline.
+
+Generates synthetic job descriptions at several sizes and scam densities and measures
+throughput and latency percentiles of extract_text_features, analyze_job_description,
+compute_confidence_from_model and the full /api/analyze round trip through Flask's test
+client. Results are written as JSON so runs can be compared:
+
+    python benchmark.py --output before.json
+    python benchmark.py --output after.json --compare before.json
+
+The analysis cache is disabled (unless --with-cache is given) and analyses are recorded
+in a throwaway database, so the numbers measure the pipeline itself.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+LEGIT_WORDS = (
+    'we are hiring a software engineer to join our platform team you will design build and '
+    'operate services collaborate with product managers and mentor engineers requirements '
+    'include experience with python databases testing and cloud infrastructure benefits '
+    'include health insurance retirement plan paid leave and a learning budget the role '
+    'reports to the engineering manager and is based in our city office'
+).split()
+
+SCAM_PHRASES = [
+    'urgent hiring', 'work from home', 'no experience needed', 'high salary', 'quick money',
+    'easy money', 'get rich quick', 'pay upfront', 'registration fee', 'processing fee',
+    'guaranteed income', 'unlimited earning potential', 'no interview required',
+    'immediate start', 'cryptocurrency', 'bitcoin', 'commission only', 'ASAP', 'cash',
+    'CALL NOW 555-123-4567', 'email hr@example.com', 'visit https://example.com', 'Apply today!!'
+]
+
+# (label, words, max characters)
+SIZES = [
+    ('100w', 100, None),
+    ('500w', 500, None),
+    ('2000w', 2000, None),
+    ('20kc', 5000, 20000),
+]
+DENSITIES = [0.0, 0.05, 0.2]
+
+
+def make_description(rng: random.Random, words: int, max_chars, density: float) -> str:
+    parts = []
+    for i in range(words):
+        if rng.random() < density:
+            parts.append(rng.choice(SCAM_PHRASES))
+        else:
+            word = rng.choice(LEGIT_WORDS)
+            parts.append(word.capitalize() if i % 12 == 0 else word)
+        if i % 12 == 11:
+            parts[-1] += '.'
+    text = ' '.join(parts)
+    return text[:max_chars] if max_chars else text
+
+
+def measure(func, inputs, iterations: int, warmup: int) -> dict:
+    for i in range(warmup):
+        func(inputs[i % len(inputs)])
+
+    timings = []
+    for i in range(iterations):
+        item = inputs[i % len(inputs)]
+        started = time.perf_counter()
+        func(item)
+        timings.append(time.perf_counter() - started)
+
+    timings.sort()
+    total = sum(timings)
+    return {
+        'iterations': iterations,
+        'throughput_per_s': round(iterations / total, 2) if total else None,
+        'mean_ms': round(statistics.fmean(timings) * 1000, 4),
+        'p50_ms': round(timings[len(timings) // 2] * 1000, 4),
+        'p99_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1000, 4),
+        'min_ms': round(timings[0] * 1000, 4),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)), stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return 'unknown'
+
+
+def import_app(args):
+    """Import app.py into a throwaway environment; returns (module, seconds the import took)."""
+    if not args.with_cache:
+        os.environ['ANALYSIS_CACHE_SIZE'] = '0'
+    os.environ.setdefault('DATABASE_PATH', os.path.join(tempfile.mkdtemp(prefix='legitmate-bench-'), 'bench.db'))
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    # The benchmark loops would trip the per-client rate limits
+    for name in ('RATE_LIMIT_ANALYZE', 'RATE_LIMIT_ANALYZE_BATCH', 'RATE_LIMIT_ANALYZE_STREAM', 'RATE_LIMIT_PREDICT'):
+        os.environ.setdefault(name, '0')
+
+    started = time.perf_counter()
+    import app as legitmate
+    return legitmate, time.perf_counter() - started
+
+
+def run(args) -> dict:
+    started = time.perf_counter()
+    legitmate, import_seconds = import_app(args)
+    legitmate.wait_until_ready()
+    ready_seconds = time.perf_counter() - started
+
+    client = legitmate.app.test_client()
+    active = legitmate.get_active_model()
+    model = active.scorer if active is not None else None
+
+    rng = random.Random(args.seed)
+    results = []
+    for label, words, max_chars in SIZES:
+        if args.sizes and label not in args.sizes:
+            continue
+        for density in DENSITIES:
+            descriptions = [make_description(rng, words, max_chars, density) for _ in range(args.variants)]
+            features = [legitmate.extract_text_features(d) for d in descriptions]
+            iterations = args.iterations
+
+            benchmarks = {
+                'extract_text_features': lambda d: legitmate.extract_text_features(d),
+                'analyze_job_description': lambda d: legitmate.analyze_job_description(d),
+                'api_analyze': lambda d: client.post('/api/analyze', json={'description': d}),
+            }
+            for name, func in benchmarks.items():
+                results.append({
+                    'benchmark': name, 'size': label, 'scam_density': density,
+                    'chars': round(statistics.fmean(len(d) for d in descriptions)),
+                    **measure(func, descriptions, iterations, args.warmup)
+                })
+            if active is not None:
+                results.append({
+                    'benchmark': 'compute_confidence_from_model', 'size': label, 'scam_density': density,
+                    'chars': round(statistics.fmean(len(d) for d in descriptions)),
+                    **measure(lambda f: legitmate.compute_confidence_from_model(model, f),
+                              features, iterations, args.warmup)
+                })
+            print(f"{label:>6} density={density:<4} done", file=sys.stderr)
+
+    legitmate.ANALYSIS_WRITER.flush()
+    return {
+        'created_at': datetime.now().isoformat(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'model_loaded': active is not None,
+        'model_backend': active.backend if active is not None else None,
+        'cache_enabled': args.with_cache,
+        'import_seconds': round(import_seconds, 4),
+        'ready_seconds': round(ready_seconds, 4),
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict) -> None:
+    def key(r):
+        return r['benchmark'], r['size'], r['scam_density']
+
+    previous = {key(r): r for r in baseline['results']}
+    print(f"{'benchmark':<32}{'size':>7}{'density':>9}{'p50 before':>12}{'p50 after':>11}{'change':>9}")
+    for r in current['results']:
+        old = previous.get(key(r))
+        if old is None:
+            continue
+        change = (r['p50_ms'] - old['p50_ms']) / old['p50_ms'] * 100 if old['p50_ms'] else 0.0
+        print(f"{r['benchmark']:<32}{r['size']:>7}{r['scam_density']:>9}"
+              f"{old['p50_ms']:>12.4f}{r['p50_ms']:>11.4f}{change:>8.1f}%")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the LegitMate analysis pipeline.')
+    parser.add_argument('--iterations', type=int, default=200, help='timed calls per benchmark')
+    parser.add_argument('--warmup', type=int, default=20, help='untimed calls before measuring')
+    parser.add_argument('--variants', type=int, default=20, help='distinct descriptions per size/density')
+    parser.add_argument('--sizes', nargs='*', choices=[s[0] for s in SIZES], help='only run these sizes')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--with-cache', action='store_true', help='keep the analysis result cache enabled')
+    parser.add_argument('--output', help='write the JSON results to this file instead of stdout')
+    parser.add_argument('--compare', help='baseline JSON file to compare p50 latencies against')
+    parser.add_argument('--import-budget', type=float,
+                        help='exit with status 1 if importing app takes longer than this many seconds')
+    parser.add_argument('--import-only', action='store_true',
+                        help='only time the import of app (for --import-budget), skip the benchmarks')
+    args = parser.parse_args()
+
+    if args.import_only:
+        report = {'import_seconds': round(import_app(args)[1], 4)}
+    else:
+        report = run(args)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+    if args.import_budget is not None and report['import_seconds'] > args.import_budget:
+        print(f"import took {report['import_seconds']:.3f}s, over the {args.import_budget:.3f}s budget",
+              file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+# Gunicorn settings for serving LegitMate in production:
+#
+#     gunicorn -c gunicorn.conf.py app:app
+#
+# The app (and with it the model) is loaded once in the master before the workers
+# are forked, so the model's memory is shared copy-on-write instead of duplicated
+# in every worker. Combine with MODEL_LOAD_MODE=mmap to also share the array data
+# through the page cache.
+#
+# Each worker serves requests on GUNICORN_THREADS threads. Analyses and predictions
+# are handed to the app's bounded inference executor and password hashing to its own
+# pool; each admitted call holds a request thread while it waits. By default the app
+# sizes both pools from GUNICORN_THREADS so that together they admit fewer calls than
+# there are threads, and answers 503 with Retry-After beyond that, so cheap routes
+# such as /api/health always find a free thread. Keep INFERENCE_WORKERS +
+# INFERENCE_QUEUE_SIZE + PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_SIZE below
+# GUNICORN_THREADS when setting them by hand.
+
+import gc
+import multiprocessing
+import os
+import sys
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', '16'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '30'))
+keepalive = 5
+preload_app = True
+
+
+def when_ready(server):
+    # The app loads its model on a background thread; let that finish before the
+    # workers are forked so they inherit it instead of each loading their own
+    legitmate = sys.modules.get('app')
+    if legitmate is not None:
+        legitmate.wait_until_ready()
+    # Keep the objects loaded so far out of the workers' garbage collections, which
+    # would otherwise write to their headers and un-share the preloaded pages
+    gc.freeze()
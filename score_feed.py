@@ -0,0 +1,85 @@
+"""Score a job feed dump from the command line.
+
+Reads NDJSON (one posting per line: {"id": ..., "description": ...} or a bare JSON
+string) or CSV with a description column, scores it in chunks with the same logic as
+/api/analyze and writes one NDJSON result per posting. Input is read and output written
+incrementally, so memory stays flat however large the feed is:
+
+    python score_feed.py feed.ndjson.gz -o scored.ndjson --processes 4
+    zcat feed.csv.gz | python score_feed.py - --format csv > scored.ndjson
+
+Results are not added to the analysis history.
+"""
+
+import argparse
+import gzip
+import io
+import json
+import os
+import sys
+import time
+
+
+def open_input(path: str):
+    if path == '-':
+        return io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', errors='replace', newline='')
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace', newline='')
+    return open(path, encoding='utf-8', errors='replace', newline='')
+
+
+def open_output(path: str):
+    if path == '-':
+        return sys.stdout
+    if path.endswith('.gz'):
+        return gzip.open(path, 'wt', encoding='utf-8')
+    return open(path, 'w', encoding='utf-8')
+
+
+def detect_format(path: str) -> str:
+    name = path[:-3] if path.endswith('.gz') else path
+    return 'csv' if name.endswith('.csv') else 'ndjson'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Score NDJSON/CSV job postings for scam risk.')
+    parser.add_argument('input', help="input file (.ndjson, .jsonl, .csv, optionally .gz) or '-' for stdin")
+    parser.add_argument('-o', '--output', default='-', help="output NDJSON file (optionally .gz), default stdout")
+    parser.add_argument('--format', choices=['ndjson', 'csv'], help='input format (default: from the file name)')
+    parser.add_argument('--chunk-size', type=int, default=None, help='postings scored per chunk')
+    parser.add_argument('--processes', type=int, default=1, help='score chunks on this many processes')
+    args = parser.parse_args()
+
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    import app as legitmate
+
+    fmt = args.format or detect_format(args.input)
+    chunk_size = args.chunk_size or legitmate.STREAM_CHUNK_SIZE
+    started = time.perf_counter()
+    scored = scams = errors = 0
+
+    with open_input(args.input) as source:
+        out = open_output(args.output)
+        try:
+            postings = legitmate.iter_postings(source, fmt)
+            for item in legitmate.score_postings(postings, chunk_size, args.processes):
+                out.write(json.dumps(item) + '\n')
+                if 'error' in item:
+                    errors += 1
+                else:
+                    scored += 1
+                    scams += bool(item['result']['is_scam'])
+        finally:
+            if out is not sys.stdout:
+                out.close()
+            else:
+                out.flush()
+
+    elapsed = time.perf_counter() - started
+    rate = scored / elapsed if elapsed else 0.0
+    print(f"Scored {scored} postings ({scams} likely scams, {errors} errors) "
+          f"in {elapsed:.1f}s ({rate:.0f}/s)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()